@@ -33,8 +33,9 @@ a = Analysis(
         "docker.api",
         "docker.models",
         "websockets",
-        "websockets.client",
+        "websockets.asyncio.client",
         "websockets.exceptions",
+        "uvloop",
         "typer",
         "typer.main",
         "rich",
@@ -43,6 +44,7 @@ a = Analysis(
         "rich.table",
         "pydantic",
         "pydantic_settings",
+        "msgspec",
         "structlog",
         "yaml",
         "aiohttp",
@@ -1,13 +1,12 @@
 """WebSocket client for backend communication with heartbeat and command handling."""
 
 import asyncio
-import json
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, cast
 
+import msgspec
 import structlog
-import websockets
-import websockets.client
-from websockets.exceptions import ConnectionClosed, InvalidStatusCode
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import ConnectionClosed, InvalidStatus
 
 from .config import BackendConfig, NodeConfig
 from .models import (
@@ -15,8 +14,6 @@ from .models import (
     AgentErrorEventData,
     BackendCommand,
     DrainNodeCommand,
-    HeartbeatEvent,
-    HeartbeatEventData,
     InstanceStartedEvent,
     InstanceStartedEventData,
     InstanceStoppedEvent,
@@ -26,11 +23,14 @@ from .models import (
     StartInstanceCommand,
     StopInstanceCommand,
     UpdateConfigCommand,
-    parse_backend_command,
+    parse_backend_command_json,
 )
 
 logger = structlog.get_logger()
 
+# Built once so sends skip msgspec's per-call encoder setup
+_encoder = msgspec.json.Encoder()
+
 
 # Type alias for command handlers
 CommandHandler = Callable[[BackendCommand], Coroutine[Any, Any, None]]
@@ -48,14 +48,21 @@ class BackendClient:
         self.backend_url = backend_config.url
         self.api_key = backend_config.api_key
         self.reconnect_delay = backend_config.reconnect_delay_seconds
+        # Exponential backoff delays for 0..5 failed attempts, capped at 5 minutes
+        self._backoff_delays = tuple(
+            min(self.reconnect_delay * (1 << attempt), 300) for attempt in range(6)
+        )
         self.max_reconnect_attempts = backend_config.max_reconnect_attempts
         self.heartbeat_interval = node_config.heartbeat_interval_seconds
         self.node_id = node_config.id
+        self._log = logger.bind(node_id=self.node_id)
 
-        self._connection: websockets.client.WebSocketClientProtocol | None = None
+        self._connection: ClientConnection | None = None
         self._connected = False
         self._should_run = False
         self._reconnect_count = 0
+        # Set by the connection loops when any of them exits, recreated per connection
+        self._disconnect_event = asyncio.Event()
 
         # Command handlers
         self._command_handlers: dict[str, CommandHandler] = {}
@@ -64,6 +71,15 @@ class BackendClient:
         self._status = NodeStatus.OFFLINE
         self._is_draining = False
 
+        # Heartbeats only differ in status and metrics, so the rest of the
+        # HeartbeatEvent envelope is rendered once up front
+        self._heartbeat_prefix = (
+            b'{"event":"heartbeat","data":{"node_id":'
+            + _encoder.encode(self.node_id)
+            + b',"status":'
+        )
+        self._status_json = {s: _encoder.encode(s.value) for s in NodeStatus}
+
     @property
     def is_connected(self) -> bool:
         """Check if currently connected."""
@@ -82,7 +98,7 @@ class BackendClient:
     def register_handler(self, event_type: str, handler: CommandHandler) -> None:
         """Register a handler for a specific command type."""
         self._command_handlers[event_type] = handler
-        logger.debug("Handler registered", event_type=event_type)
+        self._log.debug("Handler registered", event_type=event_type)
 
     async def connect(self) -> bool:
         """
@@ -92,19 +108,15 @@ class BackendClient:
             True if connection successful, False otherwise.
         """
         if self._connected:
-            logger.debug("Already connected")
+            self._log.debug("Already connected")
             return True
 
         headers = {"Authorization": f"Bearer {self.api_key}"}
 
         try:
-            logger.info(
-                "Connecting to backend",
-                url=self.backend_url,
-                node_id=self.node_id,
-            )
+            self._log.info("Connecting to backend", url=self.backend_url)
 
-            self._connection = await websockets.client.connect(
+            self._connection = await connect(
                 self.backend_url,
                 additional_headers=headers,
                 ping_interval=20,
@@ -115,18 +127,18 @@ class BackendClient:
             self._reconnect_count = 0
             self._status = NodeStatus.ONLINE
 
-            logger.info("Connected to backend successfully")
+            self._log.info("Connected to backend successfully")
             return True
 
-        except InvalidStatusCode as e:
-            logger.error(
+        except InvalidStatus as e:
+            self._log.error(
                 "Connection rejected",
-                status_code=e.status_code,
+                status_code=e.response.status_code,
                 error=str(e),
             )
             return False
         except Exception as e:
-            logger.error("Connection failed", error=str(e))
+            self._log.error("Connection failed", error=str(e))
             return False
 
     async def disconnect(self) -> None:
@@ -142,37 +154,43 @@ class BackendClient:
             self._connection = None
 
         self._connected = False
-        logger.info("Disconnected from backend")
+        self._log.info("Disconnected from backend")
 
     async def send_message(self, message: dict[str, Any]) -> bool:
         """Send a JSON message to the backend."""
+        return await self._send_encoded(_encoder.encode(message))
+
+    async def _send_encoded(self, data: bytes) -> bool:
+        """Send an already JSON-encoded message to the backend."""
         if not self.is_connected or self._connection is None:
-            logger.warning("Cannot send message, not connected")
+            self._log.warning("Cannot send message, not connected")
             return False
 
         try:
-            data = json.dumps(message)
-            await self._connection.send(data)
+            # text=True sends the UTF-8 bytes as a text frame without decoding them
+            await self._connection.send(data, text=True)
             return True
         except ConnectionClosed:
             self._connected = False
-            logger.warning("Connection closed while sending")
+            self._log.warning("Connection closed while sending")
             return False
         except Exception as e:
-            logger.error("Failed to send message", error=str(e))
+            self._log.error("Failed to send message", error=str(e))
             return False
 
     async def send_heartbeat(self, metrics: NodeMetrics) -> bool:
         """Send a heartbeat with current metrics."""
-        event = HeartbeatEvent(
-            data=HeartbeatEventData(
-                node_id=self.node_id,
-                status=self._status,
-                metrics=metrics,
+        data = b"".join(
+            (
+                self._heartbeat_prefix,
+                self._status_json[self._status],
+                b',"metrics":',
+                _encoder.encode(metrics),
+                b"}}",
             )
         )
 
-        return await self.send_message(event.model_dump())
+        return await self._send_encoded(data)
 
     async def send_instance_started(
         self,
@@ -197,7 +215,7 @@ class BackendClient:
             )
         )
 
-        return await self.send_message(event.model_dump())
+        return await self._send_encoded(_encoder.encode(event))
 
     async def send_instance_stopped(
         self,
@@ -216,7 +234,7 @@ class BackendClient:
             )
         )
 
-        return await self.send_message(event.model_dump())
+        return await self._send_encoded(_encoder.encode(event))
 
     async def send_error(
         self,
@@ -232,20 +250,17 @@ class BackendClient:
             )
         )
 
-        return await self.send_message(event.model_dump())
+        return await self._send_encoded(_encoder.encode(event))
 
-    async def _handle_message(self, raw_message: str) -> None:
+    async def _handle_message(self, raw_message: bytes) -> None:
         """Handle an incoming message from the backend."""
         try:
-            data = json.loads(raw_message)
-            event_type = data.get("event")
-
-            logger.debug("Received message", event_type=event_type)
+            # One pass parses the JSON, dispatches on "event" and validates the payload
+            command = parse_backend_command_json(raw_message)
+            # Every command Struct is tagged with its event name
+            event_type = cast(str, command.__struct_config__.tag)
 
-            command = parse_backend_command(data)
-            if command is None:
-                logger.warning("Unknown command type", event_type=event_type)
-                return
+            self._log.debug("Received message", event_type=event_type)
 
             # Find and execute handler
             handler = self._command_handlers.get(event_type)
@@ -253,37 +268,43 @@ class BackendClient:
                 try:
                     await handler(command)
                 except Exception as e:
-                    logger.error(
+                    self._log.error(
                         "Handler error",
                         event_type=event_type,
                         error=str(e),
                     )
                     await self.send_error("HANDLER_ERROR", str(e))
             else:
-                logger.warning("No handler for command", event_type=event_type)
+                self._log.warning("No handler for command", event_type=event_type)
 
-        except json.JSONDecodeError:
-            logger.error("Invalid JSON received", message=raw_message[:100])
+        except msgspec.ValidationError as e:
+            # Also raised for unknown event types
+            self._log.warning("Invalid command", error=str(e))
+        except msgspec.DecodeError:
+            self._log.error("Invalid JSON received", message=raw_message[:100])
         except Exception as e:
-            logger.error("Error handling message", error=str(e))
+            self._log.error("Error handling message", error=str(e))
 
     async def listen_commands(self) -> None:
         """Listen for incoming commands from the backend."""
         if not self.is_connected or self._connection is None:
-            logger.error("Cannot listen, not connected")
+            self._log.error("Cannot listen, not connected")
             return
 
         try:
-            async for message in self._connection:
-                if isinstance(message, bytes):
-                    message = message.decode("utf-8")
+            # Take text frames as raw bytes: msgspec validates UTF-8 while it
+            # parses, so decoding them to str first would scan each frame twice
+            while True:
+                message = await self._connection.recv(decode=False)
                 await self._handle_message(message)
         except ConnectionClosed as e:
-            logger.warning("Connection closed", code=e.code, reason=e.reason)
+            self._log.warning("Connection closed", reason=str(e))
             self._connected = False
         except Exception as e:
-            logger.error("Error in listen loop", error=str(e))
+            self._log.error("Error in listen loop", error=str(e))
             self._connected = False
+        finally:
+            self._disconnect_event.set()
 
     async def run(
         self,
@@ -308,14 +329,11 @@ class BackendClient:
                     self.max_reconnect_attempts > 0
                     and self._reconnect_count >= self.max_reconnect_attempts
                 ):
-                    logger.error("Max reconnection attempts reached")
+                    self._log.error("Max reconnection attempts reached")
                     break
 
-                delay = min(
-                    self.reconnect_delay * (2 ** min(self._reconnect_count, 5)),
-                    300,  # Max 5 minutes
-                )
-                logger.info(
+                delay = self._backoff_delays[min(self._reconnect_count, 5)]
+                self._log.info(
                     "Reconnecting",
                     attempt=self._reconnect_count,
                     delay=delay,
@@ -324,30 +342,31 @@ class BackendClient:
                 continue
 
             # Start heartbeat and listen tasks
+            self._disconnect_event = asyncio.Event()
             heartbeat_task = asyncio.create_task(
                 self._heartbeat_loop(get_metrics)
             )
             listen_task = asyncio.create_task(self.listen_commands())
 
-            # Wait for either to complete (usually means disconnect)
-            done, pending = await asyncio.wait(
-                [heartbeat_task, listen_task],
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-
-            # Cancel pending tasks
-            for task in pending:
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+            try:
+                # Wait for any of them to complete (usually means disconnect)
+                await self._disconnect_event.wait()
+            finally:
+                # Cancel pending tasks, also when run() itself is cancelled
+                for task in (heartbeat_task, listen_task):
+                    if task.done():
+                        continue
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
 
             # If we should still run, reconnect
             if self._should_run:
                 self._connected = False
                 self._reconnect_count += 1
-                logger.info("Connection lost, will reconnect")
+                self._log.info("Connection lost, will reconnect")
                 await asyncio.sleep(self.reconnect_delay)
 
     async def _heartbeat_loop(
@@ -355,15 +374,19 @@ class BackendClient:
         get_metrics: Callable[[], NodeMetrics],
     ) -> None:
         """Send heartbeats at regular intervals."""
-        while self._should_run and self.is_connected:
-            try:
-                metrics = get_metrics()
-                await self.send_heartbeat(metrics)
-                logger.debug("Heartbeat sent", status=self._status.value)
-            except Exception as e:
-                logger.error("Heartbeat failed", error=str(e))
+        try:
+            while self._should_run and self.is_connected:
+                try:
+                    # Sampling makes blocking NVML and filesystem calls
+                    metrics = await asyncio.to_thread(get_metrics)
+                    await self.send_heartbeat(metrics)
+                    self._log.debug("Heartbeat sent", status=self._status.value)
+                except Exception as e:
+                    self._log.error("Heartbeat failed", error=str(e))
 
-            await asyncio.sleep(self.heartbeat_interval)
+                await asyncio.sleep(self.heartbeat_interval)
+        finally:
+            self._disconnect_event.set()
 
     def stop(self) -> None:
         """Signal the client to stop."""
@@ -1,6 +1,8 @@
 """Configuration loading and validation for the agent."""
 
+import functools
 import os
+import re
 from pathlib import Path
 from typing import Any
 
@@ -8,6 +10,20 @@ import yaml
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# $VAR or ${VAR}, with the same variable name rules as os.path.expandvars on POSIX
+_ENV_VAR_RE = re.compile(r"\$(?:\{([^}]+)\}|(\w+))", re.ASCII)
+
+
+def _expand_env_vars(content: str) -> str:
+    """Expand environment variables in a string, leaving unset ones untouched."""
+    return _ENV_VAR_RE.sub(
+        lambda m: os.environ.get(m.group(1) or m.group(2), m.group(0)),
+        content,
+    )
+
 
 class BackendConfig(BaseSettings):
     """Backend connection configuration."""
@@ -29,6 +45,9 @@ class NodeConfig(BaseSettings):
 
     id: str = Field(default="", description="Node ID assigned after registration")
     heartbeat_interval_seconds: int = Field(default=5, ge=1)
+    # How often metrics are re-sampled; heartbeats in between resend the last values
+    metrics_cpu_interval_seconds: float = Field(default=0, ge=0)  # 0 = every heartbeat
+    metrics_gpu_interval_seconds: float = Field(default=10, ge=0)
 
 
 class FRPConfig(BaseSettings):
@@ -47,17 +66,18 @@ class DockerDefaults(BaseSettings):
     restart_policy: str = "no"
 
 
+DEFAULT_ALLOWED_IMAGES = (
+    "pytorch/pytorch:*",
+    "tensorflow/tensorflow:*",
+    "jupyter/scipy-notebook:*",
+    "nvidia/cuda:*",
+)
+
+
 class DockerConfig(BaseSettings):
     """Docker configuration."""
 
-    allowed_images: list[str] = Field(
-        default_factory=lambda: [
-            "pytorch/pytorch:*",
-            "tensorflow/tensorflow:*",
-            "jupyter/scipy-notebook:*",
-            "nvidia/cuda:*",
-        ]
-    )
+    allowed_images: list[str] = Field(default_factory=lambda: list(DEFAULT_ALLOWED_IMAGES))
     defaults: DockerDefaults = Field(default_factory=DockerDefaults)
     cleanup_after_seconds: int = Field(default=300, ge=0)
 
@@ -106,17 +126,31 @@ class AgentSettings(BaseSettings):
 
     @classmethod
     def from_yaml(cls, path: Path | str) -> "AgentSettings":
-        """Load settings from a YAML file, with environment variable expansion."""
+        """
+        Load settings from a YAML file, with environment variable expansion.
+
+        Results are cached by file path, mtime and size, so reloading an
+        unchanged file skips reading, expansion and validation. Each call
+        returns its own copy since callers modify their settings.
+        """
         path = Path(path)
         if not path.exists():
             raise FileNotFoundError(f"Configuration file not found: {path}")
 
+        stat = path.stat()
+        settings = cls._load_yaml(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        return settings.model_copy(deep=True)
+
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def _load_yaml(cls, path: str, mtime_ns: int, size: int) -> "AgentSettings":
+        """Read and parse a YAML file; mtime_ns and size only key the cache."""
         with open(path, "r") as f:
             raw_content = f.read()
 
         # Expand environment variables in the YAML content
-        expanded_content = os.path.expandvars(raw_content)
-        data = yaml.safe_load(expanded_content)
+        expanded_content = _expand_env_vars(raw_content)
+        data = yaml.load(expanded_content, Loader=_YamlLoader)
 
         return cls._from_dict(data)
 
@@ -129,7 +163,7 @@ class AgentSettings(BaseSettings):
             frp=FRPConfig(**data.get("frp", {})),
             docker=DockerConfig(
                 allowed_images=data.get("docker", {}).get(
-                    "allowed_images", DockerConfig().allowed_images
+                    "allowed_images", list(DEFAULT_ALLOWED_IMAGES)
                 ),
                 defaults=DockerDefaults(**data.get("docker", {}).get("defaults", {})),
                 cleanup_after_seconds=data.get("docker", {}).get(
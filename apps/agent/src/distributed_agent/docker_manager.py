@@ -1,11 +1,15 @@
 """Docker container management with GPU passthrough support."""
 
 import fnmatch
+import re
+import time
 from typing import Any
 
 import docker
 import docker.errors
 import docker.types
+import docker.utils
+import msgspec
 import structlog
 
 from .config import DockerConfig
@@ -13,6 +17,9 @@ from .models import ConnectionInfo, ResourceLimits, StartInstanceCommandData
 
 logger = structlog.get_logger()
 
+# How long an inspect result is reused by status/port lookups
+INSPECT_CACHE_TTL_SECONDS = 0.1
+
 
 class DockerError(Exception):
     """Base exception for Docker-related errors."""
@@ -38,8 +45,12 @@ class DockerManager:
     def __init__(self, config: DockerConfig) -> None:
         """Initialize the Docker manager."""
         self.config = config
+        self._log = logger.bind(component="docker")
         self._client: docker.DockerClient | None = None
         self._active_containers: dict[str, str] = {}  # rental_id -> container_id
+        self._allowed_images_re = self._compile_allowed_images(config.allowed_images)
+        # container_id -> (fetched_at, inspect result)
+        self._inspect_cache: dict[str, tuple[float, dict[str, Any]]] = {}
 
     @property
     def client(self) -> docker.DockerClient:
@@ -49,29 +60,84 @@ class DockerManager:
                 self._client = docker.from_env()
                 # Verify connection
                 self._client.ping()
-                logger.info("Docker client initialized")
+                self._log.info("Docker client initialized")
             except docker.errors.DockerException as e:
-                logger.error("Failed to connect to Docker daemon", error=str(e))
+                self._log.error("Failed to connect to Docker daemon", error=str(e))
                 raise DockerError(f"Cannot connect to Docker: {e}")
         return self._client
 
+    @property
+    def api(self) -> docker.APIClient:
+        """
+        Get the low-level API client backing the Docker client.
+
+        Calls by container ID go through this directly, skipping the extra
+        inspect request that ``client.containers.get`` makes first.
+        """
+        return self.client.api
+
+    def _get_json(self, path: str, *args: str, params: dict[str, Any] | None = None) -> Any:
+        """
+        GET a Docker API endpoint and decode the JSON body with msgspec.
+
+        docker-py decodes responses with the stdlib json module; inspect and
+        list payloads are large, so the status paths fetch the raw body instead.
+        These are private APIClient helpers, so the docker dependency is pinned
+        to the SDK releases they were checked against.
+        """
+        response = self.api._get(self.api._url(path, *args), params=params)
+        return msgspec.json.decode(self.api._result(response, binary=True))
+
+    def _inspect(self, container_id: str) -> dict[str, Any]:
+        """Inspect a container, sharing one result between back-to-back lookups."""
+        now = time.monotonic()
+        cached = self._inspect_cache.get(container_id)
+        if cached is not None and now - cached[0] < INSPECT_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        try:
+            info: dict[str, Any] = self._get_json("/containers/{0}/json", container_id)
+        except docker.errors.NotFound:
+            self._inspect_cache.pop(container_id, None)
+            raise
+
+        # Drop expired entries, e.g. for containers removed outside the agent
+        self._inspect_cache = {
+            cid: entry
+            for cid, entry in self._inspect_cache.items()
+            if now - entry[0] < INSPECT_CACHE_TTL_SECONDS
+        }
+        self._inspect_cache[container_id] = (now, info)
+        return info
+
+    @staticmethod
+    def _compile_allowed_images(patterns: list[str]) -> re.Pattern[str] | None:
+        """Compile the allowed image wildcards into a single regex."""
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+    def set_allowed_images(self, patterns: list[str]) -> None:
+        """Replace the allowed image patterns."""
+        self.config.allowed_images = patterns
+        self._allowed_images_re = self._compile_allowed_images(patterns)
+
     def is_image_allowed(self, image: str) -> bool:
         """Check if an image is in the allowed list."""
-        for pattern in self.config.allowed_images:
-            if fnmatch.fnmatch(image, pattern):
-                return True
-        return False
+        if self._allowed_images_re is None:
+            return False
+        return self._allowed_images_re.match(image) is not None
 
     def pull_image(self, image: str) -> None:
         """Pull a Docker image if not already present."""
         try:
             self.client.images.get(image)
-            logger.info("Image already present", image=image)
+            self._log.info("Image already present", image=image)
         except docker.errors.ImageNotFound:
-            logger.info("Pulling image", image=image)
+            self._log.info("Pulling image", image=image)
             try:
                 self.client.images.pull(image)
-                logger.info("Image pulled successfully", image=image)
+                self._log.info("Image pulled successfully", image=image)
             except docker.errors.APIError as e:
                 raise DockerError(f"Failed to pull image {image}: {e}")
 
@@ -91,7 +157,7 @@ class DockerManager:
         env_vars = config.env_vars
         port_mapping = config.proxy_port_mapping
 
-        logger.info(
+        self._log.info(
             "Starting container",
             rental_id=rental_id,
             image=image,
@@ -134,7 +200,7 @@ class DockerManager:
                 },
             )
 
-            logger.info(
+            self._log.info(
                 "Container started successfully",
                 rental_id=rental_id,
                 container_id=container_id[:12],
@@ -199,29 +265,28 @@ class DockerManager:
         timeout: int = 30,
     ) -> None:
         """Stop a running container."""
-        logger.info(
+        self._log.info(
             "Stopping container",
             container_id=container_id[:12],
             rental_id=rental_id,
             graceful=graceful,
         )
+        self._inspect_cache.pop(container_id, None)
 
         try:
-            container = self.client.containers.get(container_id)
-
             if graceful:
-                container.stop(timeout=timeout)
+                self.api.stop(container_id, timeout=timeout)
             else:
-                container.kill()
+                self.api.kill(container_id)
 
             # Remove from tracking
             if rental_id and rental_id in self._active_containers:
                 del self._active_containers[rental_id]
 
-            logger.info("Container stopped", container_id=container_id[:12])
+            self._log.info("Container stopped", container_id=container_id[:12])
 
         except docker.errors.NotFound:
-            logger.warning("Container not found", container_id=container_id[:12])
+            self._log.warning("Container not found", container_id=container_id[:12])
             # Still remove from tracking
             if rental_id and rental_id in self._active_containers:
                 del self._active_containers[rental_id]
@@ -230,12 +295,12 @@ class DockerManager:
 
     def remove_container(self, container_id: str, force: bool = False) -> None:
         """Remove a stopped container."""
+        self._inspect_cache.pop(container_id, None)
         try:
-            container = self.client.containers.get(container_id)
-            container.remove(force=force)
-            logger.info("Container removed", container_id=container_id[:12])
+            self.api.remove_container(container_id, force=force)
+            self._log.info("Container removed", container_id=container_id[:12])
         except docker.errors.NotFound:
-            logger.debug("Container already removed", container_id=container_id[:12])
+            self._log.debug("Container already removed", container_id=container_id[:12])
         except docker.errors.APIError as e:
             raise DockerError(f"Failed to remove container: {e}")
 
@@ -247,8 +312,7 @@ class DockerManager:
     ) -> str:
         """Get logs from a container."""
         try:
-            container = self.client.containers.get(container_id)
-            logs = container.logs(tail=tail, timestamps=timestamps)
+            logs = self.api.logs(container_id, tail=tail, timestamps=timestamps)
             return logs.decode("utf-8") if isinstance(logs, bytes) else logs
         except docker.errors.NotFound:
             return f"Container {container_id[:12]} not found"
@@ -258,19 +322,33 @@ class DockerManager:
     def get_container_status(self, container_id: str) -> str | None:
         """Get the status of a container."""
         try:
-            container = self.client.containers.get(container_id)
-            return container.status
+            return self._inspect(container_id)["State"]["Status"]
         except docker.errors.NotFound:
             return None
 
+    def _get_container_statuses(self, container_ids: list[str]) -> dict[str, str]:
+        """Get container_id -> status for several containers in one request."""
+        if not container_ids:
+            return {}
+
+        containers = self._get_json(
+            "/containers/json",
+            params={
+                "all": 1,
+                "filters": docker.utils.convert_filters({"id": container_ids}),
+            },
+        )
+        return {container["Id"]: container["State"] for container in containers}
+
     def list_active_rentals(self) -> dict[str, str]:
         """Get a mapping of rental_id -> container_id for active rentals."""
         # Verify containers still exist
-        active = {}
-        for rental_id, container_id in self._active_containers.items():
-            status = self.get_container_status(container_id)
-            if status is not None:
-                active[rental_id] = container_id
+        statuses = self._get_container_statuses(list(self._active_containers.values()))
+        active = {
+            rental_id: container_id
+            for rental_id, container_id in self._active_containers.items()
+            if container_id in statuses
+        }
 
         self._active_containers = active
         return active.copy()
@@ -278,9 +356,10 @@ class DockerManager:
     def cleanup_stopped_containers(self) -> list[str]:
         """Remove all stopped containers managed by this agent."""
         removed = []
+        statuses = self._get_container_statuses(list(self._active_containers.values()))
 
         for rental_id, container_id in list(self._active_containers.items()):
-            status = self.get_container_status(container_id)
+            status = statuses.get(container_id)
             if status in ("exited", "dead"):
                 try:
                     self.remove_container(container_id)
@@ -290,26 +369,26 @@ class DockerManager:
                     pass
 
         if removed:
-            logger.info("Cleaned up stopped containers", count=len(removed))
+            self._log.info("Cleaned up stopped containers", count=len(removed))
 
         return removed
 
     def get_container_ports(self, container_id: str) -> dict[str, int]:
         """Get the host port mappings for a container."""
         try:
-            container = self.client.containers.get(container_id)
-            ports = container.ports
-
-            result = {}
-            for container_port, host_bindings in ports.items():
-                if host_bindings:
-                    # Extract port number from "80/tcp" format
-                    port_num = container_port.split("/")[0]
-                    result[port_num] = int(host_bindings[0]["HostPort"])
-
-            return result
+            info = self._inspect(container_id)
+            ports = info["NetworkSettings"]["Ports"]
+            if not ports:
+                return {}
+
+            # Keys are in "80/tcp" format; unbound ports map to None
+            return {
+                container_port.partition("/")[0]: int(host_bindings[0]["HostPort"])
+                for container_port, host_bindings in ports.items()
+                if host_bindings
+            }
         except docker.errors.NotFound:
             return {}
         except Exception as e:
-            logger.warning("Failed to get container ports", error=str(e))
+            self._log.warning("Failed to get container ports", error=str(e))
             return {}
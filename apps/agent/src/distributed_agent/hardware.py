@@ -1,7 +1,12 @@
 """Hardware detection and metrics collection."""
 
+import os
 import platform
+import re
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -12,6 +17,22 @@ from .models import GPUInfo, HardwareSpecs, NetworkInfo, NodeMetrics, SystemInfo
 
 logger = structlog.get_logger()
 
+NVIDIA_SMI_QUERY = [
+    "nvidia-smi",
+    "--query-gpu=index,name,memory.total,memory.free,temperature.gpu,utilization.gpu,driver_version",
+    "--format=csv,noheader,nounits",
+]
+
+# Sampling period of the long-lived nvidia-smi process used without pynvml
+NVIDIA_SMI_STREAM_INTERVAL_MS = 1000
+
+# Byte conversions: shift ints down to MB, multiply floats by the reciprocal of a GB
+_MB_SHIFT = 20
+_GB_INV = 1 / (1 << 30)
+
+# "model name : ..." line of the first CPU block in /proc/cpuinfo
+_CPU_MODEL_RE = re.compile(rb"^model name\s*:\s*(.+)$", re.M)
+
 
 @dataclass
 class NVMLState:
@@ -24,10 +45,98 @@ class NVMLState:
 class HardwareDetector:
     """Detects and monitors system hardware capabilities."""
 
-    def __init__(self) -> None:
-        """Initialize the hardware detector."""
+    def __init__(
+        self,
+        cpu_interval: float = 0.0,
+        gpu_interval: float = 0.0,
+        enable_gpus: bool = True,
+    ) -> None:
+        """
+        Initialize the hardware detector.
+
+        Call close() (or use the detector as a context manager) to shut down
+        NVML and the nvidia-smi stream when done.
+
+        Args:
+            cpu_interval: Minimum seconds between host metric samples
+            gpu_interval: Minimum seconds between GPU metric samples
+            enable_gpus: Set to False to skip NVML/nvidia-smi and report no GPUs
+        """
+        self.enable_gpus = enable_gpus
+        self.cpu_interval = cpu_interval
+        self.gpu_interval = gpu_interval
+        self._host_sampled_at: float | None = None
+        self._gpu_sampled_at: float | None = None
         self._nvml_state = NVMLState()
-        self._init_nvml()
+        self._pynvml: Any = None  # the pynvml module, bound once NVML initializes
+        # Resolved once in refresh_topology() and reused by every GPU query
+        self._gpu_handles: list[Any] = []
+        self._gpu_static: list[tuple[str, int]] = []  # (name, vram_total_mb) per handle
+        # Per-GPU heartbeat values, written in place; sized in refresh_topology()
+        self._gpu_temp_buf: list[float] = []
+        self._gpu_util_buf: list[float] = []
+        self._gpu_mem_buf: list[int] = []
+        # Cleared for a GPU once NVML reports its temperature/utilization as unsupported
+        self._gpu_has_temp: list[bool] = []
+        self._gpu_has_util: list[bool] = []
+        # Polls GPUs in parallel (NVML releases the GIL); only used with 2+ GPUs
+        self._gpu_pool: ThreadPoolExecutor | None = None
+        self._driver_version: str | None = None
+        self._cuda_version: str | None = None
+        if enable_gpus:
+            self._init_nvml()
+
+        # Without NVML, a single nvidia-smi child streams GPU readings instead
+        self._smi_process: subprocess.Popen[str] | None = None
+        # Latest streamed reading per GPU index; replaced, never mutated, by the reader
+        self._smi_readings: dict[int, GPUInfo] = {}
+        # Set when the startup probe found no nvidia-smi or no GPUs, so it isn't re-run
+        self._smi_probe_failed = False
+        if enable_gpus and not self._nvml_state.available:
+            self._start_nvidia_smi_stream()
+
+        # Name of the psutil sensor used for CPU temperature, picked on first read
+        self._cpu_temp_sensor: str | None = None
+
+        # On Linux, /proc/stat and /proc/meminfo stay open and are re-read with pread
+        self._proc_stat_fd: int | None = None
+        self._proc_meminfo_fd: int | None = None
+        self._last_cpu_times: tuple[int, int] = (0, 0)  # (busy, total) jiffies
+        if platform.system() == "Linux":
+            try:
+                self._proc_stat_fd = os.open("/proc/stat", os.O_RDONLY)
+                self._proc_meminfo_fd = os.open("/proc/meminfo", os.O_RDONLY)
+                self._read_proc_linux()
+            except OSError as e:
+                logger.debug("Falling back to psutil for CPU/memory", error=str(e))
+                self._close_proc_fds()
+
+        # Prime psutil's CPU counters so the first non-blocking read is a real delta
+        if self._proc_stat_fd is None:
+            psutil.cpu_percent(interval=None)
+
+        # cpu_model, core counts, totals and OS info, see detect_system()
+        self._static_system: dict[str, Any] | None = None
+
+        # Result of the last successful speed test, see detect_network()
+        self._network_info: NetworkInfo | None = None
+
+        # (bytes_recv, bytes_sent, monotonic_ns) from the previous metrics read
+        self._last_net: tuple[int, int, int] | None = None
+
+        # Serializes sampling and close(). The worker thread of a cancelled
+        # heartbeat keeps running, so samples can overlap each other or shutdown.
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Reused across heartbeats, see get_current_metrics()
+        self._metrics = NodeMetrics(
+            cpu_usage_percent=0.0,
+            ram_usage_mb=0,
+            ram_total_mb=0,
+            disk_usage_gb=0.0,
+            disk_total_gb=0.0,
+        )
 
     def _init_nvml(self) -> None:
         """Initialize NVIDIA Management Library if available."""
@@ -35,6 +144,7 @@ class HardwareDetector:
             import pynvml
 
             pynvml.nvmlInit()
+            self._pynvml = pynvml
             self._nvml_state.initialized = True
             self._nvml_state.available = True
             logger.info("NVML initialized successfully")
@@ -45,73 +155,256 @@ class HardwareDetector:
             logger.warning("NVML initialization failed", error=str(e))
             self._nvml_state.available = False
 
+        if self._nvml_state.available:
+            self.refresh_topology()
+
+    def refresh_topology(self) -> None:
+        """Re-resolve GPU device handles and driver info, e.g. after a GPU hotplug."""
+        if not self._nvml_state.available:
+            return
+
+        pynvml = self._pynvml
+        try:
+            device_count = pynvml.nvmlDeviceGetCount()
+            self._gpu_handles = [
+                pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(device_count)
+            ]
+            self._driver_version = pynvml.nvmlSystemGetDriverVersion()
+            self._gpu_static = self._detect_gpus_static()
+        except Exception as e:
+            logger.warning("GPU topology detection failed", error=str(e))
+            self._gpu_handles = []
+            self._gpu_static = []
+            self._resize_gpu_buffers()
+            return
+
+        self._resize_gpu_buffers()
+
+        # Get CUDA version
+        try:
+            cuda_version = pynvml.nvmlSystemGetCudaDriverVersion_v2()
+            self._cuda_version = f"{cuda_version // 1000}.{(cuda_version % 1000) // 10}"
+        except Exception:
+            self._cuda_version = None
+
+    def _resize_gpu_buffers(self) -> None:
+        """Size the per-GPU heartbeat buffers and poll pool to the current handle count."""
+        count = len(self._gpu_handles)
+        self._gpu_temp_buf = [0.0] * count
+        self._gpu_util_buf = [0.0] * count
+        self._gpu_mem_buf = [0] * count
+        self._gpu_has_temp = [True] * count
+        self._gpu_has_util = [True] * count
+
+        self._shutdown_gpu_pool()
+        if count > 1:
+            self._gpu_pool = ThreadPoolExecutor(
+                max_workers=min(count, os.cpu_count() or 1, 8),
+                thread_name_prefix="nvml-poll",
+            )
+
+    def _shutdown_gpu_pool(self) -> None:
+        """Shut down the GPU polling thread pool if running."""
+        if self._gpu_pool is not None:
+            self._gpu_pool.shutdown(wait=False)
+            self._gpu_pool = None
+
     def _cleanup_nvml(self) -> None:
         """Shutdown NVML if initialized."""
         if self._nvml_state.initialized:
             try:
-                import pynvml
-
-                pynvml.nvmlShutdown()
+                self._pynvml.nvmlShutdown()
             except Exception:
                 pass
             self._nvml_state.initialized = False
 
-    def __del__(self) -> None:
-        """Cleanup on destruction."""
-        self._cleanup_nvml()
+    def _close_proc_fds(self) -> None:
+        """Close the /proc file descriptors used on Linux."""
+        for fd in (self._proc_stat_fd, self._proc_meminfo_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._proc_stat_fd = None
+        self._proc_meminfo_fd = None
 
-    def detect_gpus(self) -> list[GPUInfo]:
-        """Detect available NVIDIA GPUs using pynvml."""
-        gpus: list[GPUInfo] = []
+    def _read_proc_linux(self) -> tuple[float, int, int]:
+        """
+        Read CPU usage and memory straight from /proc.
 
-        if not self._nvml_state.available:
-            # Try fallback to nvidia-smi
-            return self._detect_gpus_nvidia_smi()
+        Returns:
+            Tuple of (cpu_usage_percent, ram_used_mb, ram_total_mb), where CPU
+            usage is measured since the previous call and used memory matches
+            psutil's MemTotal - MemAvailable.
+        """
+        assert self._proc_stat_fd is not None and self._proc_meminfo_fd is not None
+
+        # "cpu  user nice system idle iowait irq softirq steal guest guest_nice"
+        fields = os.pread(self._proc_stat_fd, 256, 0).split(b"\n", 1)[0].split()
+        times = [int(value) for value in fields[1:9]]  # guest time is already in user
+        total = sum(times)
+        busy = total - times[3] - times[4]
+
+        last_busy, last_total = self._last_cpu_times
+        self._last_cpu_times = (busy, total)
+        total_delta = total - last_total
+        cpu_usage = 0.0
+        if total_delta > 0:
+            cpu_usage = round(min(max((busy - last_busy) / total_delta, 0.0), 1.0) * 100, 1)
+
+        # MemTotal and MemAvailable are among the first few lines, in kB
+        mem_total_kb = mem_available_kb = 0
+        for line in os.pread(self._proc_meminfo_fd, 256, 0).split(b"\n"):
+            if line.startswith(b"MemTotal:"):
+                mem_total_kb = int(line.split()[1])
+            elif line.startswith(b"MemAvailable:"):
+                mem_available_kb = int(line.split()[1])
+                break
+
+        return cpu_usage, (mem_total_kb - mem_available_kb) >> 10, mem_total_kb >> 10
+
+    def _start_nvidia_smi_stream(self) -> None:
+        """Start a long-lived ``nvidia-smi -lms`` process and a thread reading it."""
+        gpus = self._detect_gpus_nvidia_smi()
+        if not gpus:
+            self._smi_probe_failed = True
+            return
 
         try:
-            import pynvml
+            self._smi_process = subprocess.Popen(
+                [*NVIDIA_SMI_QUERY, "-lms", str(NVIDIA_SMI_STREAM_INTERVAL_MS)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as e:
+            logger.warning("Failed to start nvidia-smi stream", error=str(e))
+            return
+
+        # Each new line replaces that GPU's previous reading
+        self._smi_readings = {gpu.index: gpu for gpu in gpus}
+        threading.Thread(
+            target=self._read_nvidia_smi_stream,
+            args=(self._smi_process,),
+            name="nvidia-smi-reader",
+            daemon=True,
+        ).start()
+        logger.info("nvidia-smi stream started", count=len(gpus))
+
+    def _read_nvidia_smi_stream(self, process: subprocess.Popen[str]) -> None:
+        """Store each line from the nvidia-smi stream as its GPU's latest reading."""
+        assert process.stdout is not None
+        for line in process.stdout:
+            gpu = self._parse_nvidia_smi_line(line)
+            if gpu is not None:
+                # Swap in a new dict so detect_gpus() never sees one change size
+                self._smi_readings = {**self._smi_readings, gpu.index: gpu}
+
+        logger.warning("nvidia-smi stream ended", returncode=process.poll())
+
+    def _stop_nvidia_smi_stream(self) -> None:
+        """Terminate the nvidia-smi stream process if running."""
+        if self._smi_process is None:
+            return
 
-            device_count = pynvml.nvmlDeviceGetCount()
-            driver_version = pynvml.nvmlSystemGetDriverVersion()
+        try:
+            self._smi_process.terminate()
+            self._smi_process.wait(timeout=5)
+        except Exception:
+            pass
+        self._smi_process = None
 
-            for i in range(device_count):
-                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                name = pynvml.nvmlDeviceGetName(handle)
-                if isinstance(name, bytes):
-                    name = name.decode("utf-8")
+    def close(self) -> None:
+        """Release NVML, the nvidia-smi stream and the /proc file descriptors."""
+        with self._lock:
+            self._closed = True
+            self._shutdown_gpu_pool()
+            self._cleanup_nvml()
+            self._stop_nvidia_smi_stream()
+            self._close_proc_fds()
 
-                memory_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+    def __enter__(self) -> "HardwareDetector":
+        """Enter the context manager."""
+        return self
 
-                # Get CUDA version
-                try:
-                    cuda_version = pynvml.nvmlSystemGetCudaDriverVersion_v2()
-                    cuda_str = f"{cuda_version // 1000}.{(cuda_version % 1000) // 10}"
-                except Exception:
-                    cuda_str = None
+    def __exit__(self, *exc_info: object) -> None:
+        """Release hardware resources on exit."""
+        self.close()
 
-                # Get temperature and utilization
-                try:
-                    temp = pynvml.nvmlDeviceGetTemperature(
-                        handle, pynvml.NVML_TEMPERATURE_GPU
-                    )
-                except Exception:
-                    temp = None
+    def _detect_gpus_static(self) -> list[tuple[str, int]]:
+        """Read the GPU properties that never change: (name, vram_total_mb) per handle."""
+        pynvml = self._pynvml
 
-                try:
-                    util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                    utilization = float(util.gpu)
-                except Exception:
-                    utilization = None
+        static: list[tuple[str, int]] = []
+        for handle in self._gpu_handles:
+            name = pynvml.nvmlDeviceGetName(handle)
+            if isinstance(name, bytes):
+                name = name.decode("utf-8")
+
+            memory_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            static.append((name, memory_info.total >> _MB_SHIFT))
+
+        return static
+
+    def _poll_gpu_dynamic(self, handle: Any) -> tuple[float | None, float | None, int]:
+        """Read the changing GPU values: (temperature, utilization, vram_available_mb)."""
+        pynvml = self._pynvml
+
+        memory_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+
+        # Get temperature and utilization
+        try:
+            temperature = float(
+                pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+            )
+        except Exception:
+            temperature = None
+
+        try:
+            utilization = float(pynvml.nvmlDeviceGetUtilizationRates(handle).gpu)
+        except Exception:
+            utilization = None
+
+        return temperature, utilization, memory_info.free >> _MB_SHIFT
+
+    def detect_gpus(self) -> list[GPUInfo]:
+        """Detect available NVIDIA GPUs using pynvml."""
+        gpus: list[GPUInfo] = []
+
+        if not self.enable_gpus:
+            return gpus
+
+        if not self._nvml_state.available:
+            # Use the latest streamed readings, or fall back to a one-off nvidia-smi
+            if self._smi_probe_failed:
+                return gpus
+            if self._smi_process is not None and self._smi_process.poll() is None:
+                readings = list(self._smi_readings.values())
+                return sorted(readings, key=lambda gpu: gpu.index)
+            return self._detect_gpus_nvidia_smi()
+
+        if self._gpu_pool is not None:
+            readings = self._gpu_pool.map(self._poll_gpu_dynamic, self._gpu_handles)
+        else:
+            readings = map(self._poll_gpu_dynamic, self._gpu_handles)
+
+        try:
+            for i, ((name, vram_total_mb), reading) in enumerate(
+                zip(self._gpu_static, readings, strict=True)
+            ):
+                temperature, utilization, vram_available_mb = reading
 
                 gpus.append(
                     GPUInfo(
                         index=i,
                         name=name,
-                        vram_total_mb=memory_info.total // (1024 * 1024),
-                        vram_available_mb=memory_info.free // (1024 * 1024),
-                        cuda_version=cuda_str,
-                        driver_version=driver_version,
-                        temperature=float(temp) if temp is not None else None,
+                        vram_total_mb=vram_total_mb,
+                        vram_available_mb=vram_available_mb,
+                        cuda_version=self._cuda_version,
+                        driver_version=self._driver_version,
+                        temperature=temperature,
                         utilization=utilization,
                     )
                 )
@@ -128,11 +421,7 @@ class HardwareDetector:
 
         try:
             result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-gpu=index,name,memory.total,memory.free,temperature.gpu,utilization.gpu,driver_version",
-                    "--format=csv,noheader,nounits",
-                ],
+                NVIDIA_SMI_QUERY,
                 capture_output=True,
                 text=True,
                 timeout=10,
@@ -143,26 +432,9 @@ class HardwareDetector:
                 return gpus
 
             for line in result.stdout.strip().split("\n"):
-                if not line:
-                    continue
-
-                parts = [p.strip() for p in line.split(",")]
-                if len(parts) >= 5:
-                    idx, name, mem_total, mem_free, temp = parts[:5]
-                    utilization = parts[5] if len(parts) > 5 else None
-                    driver = parts[6] if len(parts) > 6 else None
-
-                    gpus.append(
-                        GPUInfo(
-                            index=int(idx),
-                            name=name,
-                            vram_total_mb=int(float(mem_total)),
-                            vram_available_mb=int(float(mem_free)),
-                            driver_version=driver,
-                            temperature=float(temp) if temp else None,
-                            utilization=float(utilization) if utilization else None,
-                        )
-                    )
+                gpu = self._parse_nvidia_smi_line(line)
+                if gpu is not None:
+                    gpus.append(gpu)
 
         except FileNotFoundError:
             logger.info("nvidia-smi not found, no NVIDIA GPUs available")
@@ -173,51 +445,77 @@ class HardwareDetector:
 
         return gpus
 
-    def detect_system(self) -> SystemInfo:
-        """Detect system hardware specifications."""
+    @staticmethod
+    def _parse_nvidia_smi_line(line: str) -> GPUInfo | None:
+        """Parse one CSV line of NVIDIA_SMI_QUERY output."""
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) < 5:
+            return None
+
+        idx, name, mem_total, mem_free, temp = parts[:5]
+        utilization = parts[5] if len(parts) > 5 else None
+        driver = parts[6] if len(parts) > 6 else None
+
+        try:
+            return GPUInfo(
+                index=int(idx),
+                name=name,
+                vram_total_mb=int(float(mem_total)),
+                vram_available_mb=int(float(mem_free)),
+                driver_version=driver,
+                temperature=float(temp) if temp else None,
+                utilization=float(utilization) if utilization else None,
+            )
+        except ValueError:
+            return None
+
+    def _detect_system_static(self) -> dict[str, Any]:
+        """Read the system properties that never change while the agent runs."""
         # CPU info
         cpu_model = platform.processor() or "Unknown"
         if not cpu_model or cpu_model == "Unknown":
             # Try to get more detailed CPU info
             try:
                 if platform.system() == "Linux":
-                    with open("/proc/cpuinfo", "r") as f:
-                        for line in f:
-                            if "model name" in line:
-                                cpu_model = line.split(":")[1].strip()
-                                break
+                    # The first CPU block is enough
+                    with open("/proc/cpuinfo", "rb") as f:
+                        match = _CPU_MODEL_RE.search(f.read(4096))
+                    if match:
+                        cpu_model = match.group(1).decode("utf-8", "replace").strip()
             except Exception:
                 pass
 
-        cpu_cores = psutil.cpu_count(logical=False) or 1
-        cpu_threads = psutil.cpu_count(logical=True) or 1
-
-        # Memory info
-        mem = psutil.virtual_memory()
-        ram_total_mb = mem.total // (1024 * 1024)
-        ram_available_mb = mem.available // (1024 * 1024)
-
         # Disk info (root partition)
         disk = psutil.disk_usage("/")
-        disk_total_gb = disk.total / (1024**3)
-        disk_available_gb = disk.free / (1024**3)
 
-        # OS info
-        os_name = platform.system()
-        os_version = platform.release()
-        hostname = platform.node()
+        return {
+            "cpu_model": cpu_model,
+            "cpu_cores": psutil.cpu_count(logical=False) or 1,
+            "cpu_threads": psutil.cpu_count(logical=True) or 1,
+            "ram_total_mb": psutil.virtual_memory().total >> _MB_SHIFT,
+            "disk_total_gb": round(disk.total * _GB_INV, 2),
+            "os_name": platform.system(),
+            "os_version": platform.release(),
+            "hostname": platform.node(),
+        }
+
+    def detect_system(self) -> SystemInfo:
+        """
+        Detect system hardware specifications.
+
+        Only available RAM and disk space are read on each call; everything
+        else is detected once and cached.
+        """
+        if self._static_system is None:
+            self._static_system = self._detect_system_static()
+
+        mem = psutil.virtual_memory()
+        disk = psutil.disk_usage("/")
 
         return SystemInfo(
-            cpu_model=cpu_model,
-            cpu_cores=cpu_cores,
-            cpu_threads=cpu_threads,
-            ram_total_mb=ram_total_mb,
-            ram_available_mb=ram_available_mb,
-            disk_total_gb=round(disk_total_gb, 2),
-            disk_available_gb=round(disk_available_gb, 2),
-            os_name=os_name,
-            os_version=os_version,
-            hostname=hostname,
+            **self._static_system,
+            ram_available_mb=mem.available >> _MB_SHIFT,
+            disk_available_gb=round(disk.free * _GB_INV, 2),
         )
 
     def detect_network(self, timeout: int = 30) -> NetworkInfo | None:
@@ -225,7 +523,8 @@ class HardwareDetector:
         Detect network bandwidth using speedtest-cli.
 
         This can be slow (30+ seconds), so it's optional and should only
-        be called during initial registration.
+        be called once, off the event loop. A successful result is cached
+        for get_full_specs().
         """
         try:
             import speedtest
@@ -240,11 +539,12 @@ class HardwareDetector:
             # Get latency from best server
             latency = st.results.ping
 
-            return NetworkInfo(
+            self._network_info = NetworkInfo(
                 download_mbps=round(download, 2),
                 upload_mbps=round(upload, 2),
                 latency_ms=round(latency, 2),
             )
+            return self._network_info
         except ImportError:
             logger.warning("speedtest-cli not installed")
             return None
@@ -253,10 +553,17 @@ class HardwareDetector:
             return None
 
     def get_full_specs(self, include_network: bool = False) -> HardwareSpecs:
-        """Get complete hardware specifications for registration."""
+        """
+        Get complete hardware specifications for registration.
+
+        Uses the cached speed test result if there is one; otherwise the
+        test only runs when include_network is set.
+        """
         gpus = self.detect_gpus()
         system = self.detect_system()
-        network = self.detect_network() if include_network else None
+        network = self._network_info
+        if network is None and include_network:
+            network = self.detect_network()
 
         return HardwareSpecs(
             gpus=gpus,
@@ -265,62 +572,164 @@ class HardwareDetector:
         )
 
     def get_current_metrics(self) -> NodeMetrics:
-        """Get current real-time metrics for heartbeat."""
-        # CPU temperature (Linux only, may require lm-sensors)
-        cpu_temp = self._get_cpu_temperature()
+        """
+        Get current real-time metrics for heartbeat.
 
-        # CPU usage
-        cpu_usage = psutil.cpu_percent(interval=0.1)
+        Host (CPU, memory, disk, network) and GPU values are re-sampled only
+        once their configured interval has passed; otherwise the previous
+        readings are kept. The same NodeMetrics instance is updated in place
+        and returned on every call, so callers should encode it before the
+        next call. After close(), the last readings are returned unchanged.
+        """
+        metrics = self._metrics
 
-        # Memory
-        mem = psutil.virtual_memory()
-        ram_usage_mb = mem.used // (1024 * 1024)
-        ram_total_mb = mem.total // (1024 * 1024)
+        with self._lock:
+            if self._closed:
+                return metrics
 
-        # Disk
-        disk = psutil.disk_usage("/")
-        disk_usage_gb = disk.used / (1024**3)
-        disk_total_gb = disk.total / (1024**3)
+            now = time.monotonic()
+
+            if self._host_sampled_at is None or now - self._host_sampled_at >= self.cpu_interval:
+                self._host_sampled_at = now
+                self._sample_host_metrics(metrics)
+
+            if self._gpu_sampled_at is None or now - self._gpu_sampled_at >= self.gpu_interval:
+                self._gpu_sampled_at = now
+                self._sample_gpu_metrics(metrics)
+
+        return metrics
+
+    def _sample_host_metrics(self, metrics: NodeMetrics) -> None:
+        """Update the CPU, memory, disk and network fields of metrics."""
+        # CPU temperature (Linux only, may require lm-sensors)
+        cpu_temp = self._get_cpu_temperature()
 
-        # Network I/O (approximate rates)
+        if self._proc_stat_fd is not None:
+            # CPU usage and memory from /proc on Linux
+            cpu_usage, ram_usage_mb, ram_total_mb = self._read_proc_linux()
+        else:
+            # CPU usage since the previous call, without blocking to sample
+            cpu_usage = psutil.cpu_percent(interval=None)
+
+            # Memory
+            mem = psutil.virtual_memory()
+            ram_usage_mb = mem.used >> _MB_SHIFT
+            ram_total_mb = mem.total >> _MB_SHIFT
+
+        # Disk (on POSIX, the same statvfs call psutil.disk_usage makes)
+        if hasattr(os, "statvfs"):
+            vfs = os.statvfs("/")
+            disk_total_gb = vfs.f_blocks * vfs.f_frsize * _GB_INV
+            disk_usage_gb = (vfs.f_blocks - vfs.f_bfree) * vfs.f_frsize * _GB_INV
+        else:
+            disk = psutil.disk_usage("/")
+            disk_total_gb = disk.total * _GB_INV
+            disk_usage_gb = disk.used * _GB_INV
+
+        # Network I/O rates from the change in cumulative bytes since the last call
         net_io = psutil.net_io_counters()
-        # Note: These are cumulative bytes, not rates. For rates you'd need
-        # to track deltas over time. For now we return 0.
+        now_ns = time.monotonic_ns()
         network_rx_mbps = 0.0
         network_tx_mbps = 0.0
+        if self._last_net is not None:
+            last_recv, last_sent, last_ns = self._last_net
+            elapsed_ns = now_ns - last_ns
+            if elapsed_ns > 0:
+                # bytes * 8 / 1e6 per (ns / 1e9) == bytes * 8000 / ns
+                network_rx_mbps = round(
+                    max(net_io.bytes_recv - last_recv, 0) * 8000 / elapsed_ns, 3
+                )
+                network_tx_mbps = round(
+                    max(net_io.bytes_sent - last_sent, 0) * 8000 / elapsed_ns, 3
+                )
+        self._last_net = (net_io.bytes_recv, net_io.bytes_sent, now_ns)
+
+        metrics.cpu_temp = cpu_temp
+        metrics.cpu_usage_percent = cpu_usage
+        metrics.ram_usage_mb = ram_usage_mb
+        metrics.ram_total_mb = ram_total_mb
+        metrics.disk_usage_gb = round(disk_usage_gb, 2)
+        metrics.disk_total_gb = round(disk_total_gb, 2)
+        metrics.network_rx_mbps = network_rx_mbps
+        metrics.network_tx_mbps = network_tx_mbps
+
+    def _sample_gpu_metrics(self, metrics: NodeMetrics) -> None:
+        """Update the per-GPU fields of metrics."""
+        gpu_temps, gpu_utils, gpu_mem_used = self._collect_gpu_metrics_raw()
+        metrics.gpu_temp = gpu_temps
+        metrics.gpu_utilization = gpu_utils
+        metrics.gpu_memory_used_mb = gpu_mem_used
+
+    def _collect_gpu_metrics_raw(self) -> tuple[list[float], list[float], list[int]]:
+        """
+        Read per-GPU temperature, utilization and used VRAM for heartbeats.
 
-        # GPU metrics
-        gpu_temps: list[float] = []
-        gpu_utils: list[float] = []
-        gpu_mem_used: list[int] = []
+        Queries the cached NVML handles directly instead of going through
+        detect_gpus(), so no GPUInfo models are built. Missing temperature or
+        utilization readings are reported as 0.0. With NVML, the returned
+        lists are buffers overwritten on the next call and must not be
+        modified by callers.
+        """
+        if not self._nvml_state.available:
+            # Harvest the streamed (or one-off) nvidia-smi readings
+            gpus = self.detect_gpus()
+            return (
+                [gpu.temperature or 0.0 for gpu in gpus],
+                [gpu.utilization or 0.0 for gpu in gpus],
+                [gpu.vram_total_mb - gpu.vram_available_mb for gpu in gpus],
+            )
 
-        gpus = self.detect_gpus()
-        for gpu in gpus:
-            if gpu.temperature is not None:
-                gpu_temps.append(gpu.temperature)
-            else:
-                gpu_temps.append(0.0)
+        gpu_temps = self._gpu_temp_buf
+        gpu_utils = self._gpu_util_buf
+        gpu_mem_used = self._gpu_mem_buf
+
+        pynvml = self._pynvml
+        get_memory_info = pynvml.nvmlDeviceGetMemoryInfo
+        get_temperature = pynvml.nvmlDeviceGetTemperature
+        get_utilization = pynvml.nvmlDeviceGetUtilizationRates
+        temperature_gpu = pynvml.NVML_TEMPERATURE_GPU
+        not_supported = pynvml.NVMLError_NotSupported
+
+        handles = self._gpu_handles
+        static = self._gpu_static
+        has_temp = self._gpu_has_temp
+        has_util = self._gpu_has_util
+
+        def poll(i: int) -> None:
+            handle = handles[i]
+            gpu_mem_used[i] = static[i][1] - (get_memory_info(handle).free >> _MB_SHIFT)
+
+            # Unsupported readings stay 0.0 without another driver round trip
+            if has_temp[i]:
+                try:
+                    gpu_temps[i] = float(get_temperature(handle, temperature_gpu))
+                except not_supported:
+                    has_temp[i] = False
+                    gpu_temps[i] = 0.0
+                except Exception:
+                    gpu_temps[i] = 0.0
+
+            if has_util[i]:
+                try:
+                    gpu_utils[i] = float(get_utilization(handle).gpu)
+                except not_supported:
+                    has_util[i] = False
+                    gpu_utils[i] = 0.0
+                except Exception:
+                    gpu_utils[i] = 0.0
 
-            if gpu.utilization is not None:
-                gpu_utils.append(gpu.utilization)
+        try:
+            if self._gpu_pool is not None:
+                # Each GPU writes only its own buffer slots
+                for _ in self._gpu_pool.map(poll, range(len(handles))):
+                    pass
             else:
-                gpu_utils.append(0.0)
-
-            gpu_mem_used.append(gpu.vram_total_mb - gpu.vram_available_mb)
-
-        return NodeMetrics(
-            cpu_temp=cpu_temp,
-            cpu_usage_percent=cpu_usage,
-            gpu_temp=gpu_temps,
-            gpu_utilization=gpu_utils,
-            gpu_memory_used_mb=gpu_mem_used,
-            ram_usage_mb=ram_usage_mb,
-            ram_total_mb=ram_total_mb,
-            disk_usage_gb=round(disk_usage_gb, 2),
-            disk_total_gb=round(disk_total_gb, 2),
-            network_rx_mbps=network_rx_mbps,
-            network_tx_mbps=network_tx_mbps,
-        )
+                for i in range(len(handles)):
+                    poll(i)
+        except Exception as e:
+            logger.warning("GPU metrics collection failed", error=str(e))
+
+        return gpu_temps, gpu_utils, gpu_mem_used
 
     def _get_cpu_temperature(self) -> float | None:
         """Get CPU temperature if available."""
@@ -329,17 +738,22 @@ class HardwareDetector:
             if not temps:
                 return None
 
+            if self._cpu_temp_sensor is not None:
+                readings = temps.get(self._cpu_temp_sensor)
+                if readings:
+                    return float(readings[0].current)
+
             # Try common sensor names
             for name in ["coretemp", "cpu_thermal", "k10temp", "zenpower"]:
-                if name in temps:
-                    readings = temps[name]
-                    if readings:
-                        return readings[0].current
+                if temps.get(name):
+                    self._cpu_temp_sensor = name
+                    return float(temps[name][0].current)
 
-            # Just return the first available
-            for readings in temps.values():
+            # Just use the first available
+            for name, readings in temps.items():
                 if readings:
-                    return readings[0].current
+                    self._cpu_temp_sensor = name
+                    return float(readings[0].current)
 
         except Exception:
             pass
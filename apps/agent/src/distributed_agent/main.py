@@ -1,21 +1,20 @@
 """Main entry point and CLI for the DistributedCompute Host Agent."""
 
 import asyncio
+import functools
+import logging
 import signal
 import sys
+import threading
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import structlog
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
 from . import __version__
 from .backend_client import BackendClient
 from .config import AgentSettings
-from .docker_manager import DockerManager
 from .hardware import HardwareDetector
 from .models import (
     BackendCommand,
@@ -27,25 +26,25 @@ from .models import (
 )
 from .tunnel import TunnelManager
 
-# Configure structlog
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Configure structlog. The chain is kept short since it runs for every event;
+# ConsoleRenderer formats exc_info itself when a traceback is logged, and the
+# filtering bound logger turns calls below the level into no-ops.
 structlog.configure(
     processors=[
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
         structlog.dev.ConsoleRenderer(),
     ],
-    wrapper_class=structlog.stdlib.BoundLogger,
+    wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
     context_class=dict,
     logger_factory=structlog.PrintLoggerFactory(),
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
-console = Console()
 app = typer.Typer(
     name="distributed-agent",
     help="DistributedCompute Host Agent - Manage GPU resources for rental marketplace",
@@ -59,7 +58,13 @@ class AgentOrchestrator:
     def __init__(self, settings: AgentSettings) -> None:
         """Initialize the orchestrator."""
         self.settings = settings
-        self.hardware = HardwareDetector()
+        # docker is only imported by the commands that run the agent
+        from .docker_manager import DockerManager
+
+        self.hardware = HardwareDetector(
+            cpu_interval=settings.node.metrics_cpu_interval_seconds,
+            gpu_interval=settings.node.metrics_gpu_interval_seconds,
+        )
         self.docker = DockerManager(settings.docker)
         self.tunnel = TunnelManager(settings.frp)
         self.backend = BackendClient(settings.backend, settings.node)
@@ -95,7 +100,7 @@ class AgentOrchestrator:
             local_ports = self.docker.get_container_ports(container_id)
 
             # Create tunnel
-            self.tunnel.create_tunnel(
+            await self.tunnel.create_tunnel(
                 rental_id=rental_id,
                 port_mapping=data.proxy_port_mapping,
                 local_ports=local_ports,
@@ -139,7 +144,7 @@ class AgentOrchestrator:
 
         try:
             # Destroy tunnel first
-            self.tunnel.destroy_tunnel(rental_id)
+            await self.tunnel.destroy_tunnel(rental_id)
 
             # Stop container
             self.docker.stop_container(
@@ -196,7 +201,7 @@ class AgentOrchestrator:
             self.backend.heartbeat_interval = config.heartbeat_interval_ms / 1000
 
         if config.allowed_images:
-            self.settings.docker.allowed_images = config.allowed_images
+            self.docker.set_allowed_images(config.allowed_images)
 
     def _get_metrics(self) -> Any:
         """Get current metrics for heartbeat."""
@@ -221,13 +226,66 @@ class AgentOrchestrator:
             ram_gb=specs.system.ram_total_mb // 1024,
         )
 
+        # Measure bandwidth once in the background; the result is cached for later
+        # specs. A daemon thread rather than the default executor, which
+        # asyncio.run() waits on at exit, so the 30s+ test never delays shutdown.
+        threading.Thread(
+            target=self._detect_network, name="speedtest", daemon=True
+        ).start()
+
+        self._install_signal_handlers()
+        backend_task = asyncio.create_task(self.backend.run(self._get_metrics))
+        shutdown_task = asyncio.create_task(self._shutdown_event.wait())
+
         try:
-            await self.backend.run(self._get_metrics)
+            done, _ = await asyncio.wait(
+                (backend_task, shutdown_task),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if backend_task in done:
+                backend_task.result()
         except asyncio.CancelledError:
             logger.info("Agent cancelled")
         finally:
+            for task in (backend_task, shutdown_task):
+                if not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
             await self.shutdown()
 
+    def _install_signal_handlers(self) -> None:
+        """Request shutdown on SIGINT/SIGTERM from within the event loop."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.request_shutdown)
+            except NotImplementedError:
+                # Windows event loops have no add_signal_handler
+                signal.signal(
+                    sig, lambda *_: loop.call_soon_threadsafe(self.request_shutdown)
+                )
+
+    def request_shutdown(self) -> None:
+        """Stop the backend client and wake run() so it shuts down."""
+        if not self._shutdown_event.is_set():
+            logger.info("Received shutdown signal")
+        self.backend.stop()
+        self._shutdown_event.set()
+
+    def _detect_network(self) -> None:
+        """Run the speed test and log its result (in the speedtest thread)."""
+        network = self.hardware.detect_network()
+        if network is not None:
+            logger.info(
+                "Network detected",
+                download_mbps=network.download_mbps,
+                upload_mbps=network.upload_mbps,
+                latency_ms=network.latency_ms,
+            )
+
     async def shutdown(self) -> None:
         """Graceful shutdown."""
         if not self._running:
@@ -243,7 +301,10 @@ class AgentOrchestrator:
         await self.backend.disconnect()
 
         # Destroy all tunnels
-        self.tunnel.destroy_all_tunnels()
+        await self.tunnel.destroy_all_tunnels()
+
+        # Release NVML and hardware polling resources
+        self.hardware.close()
 
         # Note: We don't stop containers on shutdown - they continue running
         # This allows for agent restarts without disrupting rentals
@@ -251,17 +312,25 @@ class AgentOrchestrator:
         logger.info("Agent shutdown complete")
 
 
+@functools.lru_cache(maxsize=1)
+def _get_console() -> "Console":
+    """Create the rich console on first use, keeping rich off the import path."""
+    from rich.console import Console
+
+    return Console()
+
+
 def setup_logging(level: str, fmt: str) -> None:
     """Configure logging based on settings."""
-    import logging
-
     log_level = getattr(logging, level.upper(), logging.INFO)
     logging.basicConfig(level=log_level)
 
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(log_level))
+
     if fmt == "json":
         structlog.configure(
             processors=[
-                structlog.stdlib.add_log_level,
+                structlog.processors.add_log_level,
                 structlog.processors.TimeStamper(fmt="iso"),
                 structlog.processors.JSONRenderer(),
             ],
@@ -284,6 +353,9 @@ def start(
     ),
 ) -> None:
     """Start the agent and connect to the backend."""
+    from rich.panel import Panel
+
+    console = _get_console()
     console.print(
         Panel.fit(
             f"[bold blue]DistributedCompute Agent[/bold blue] v{__version__}",
@@ -316,13 +388,13 @@ def start(
     # Create orchestrator
     orchestrator = AgentOrchestrator(settings)
 
-    # Setup signal handlers
-    def signal_handler(sig: int, frame: Any) -> None:
-        console.print("\n[yellow]Received shutdown signal...[/yellow]")
-        orchestrator.backend.stop()
+    # Use uvloop's faster event loop where it is available (not on Windows)
+    try:
+        import uvloop
 
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
     # Run
     console.print("[green]Starting agent...[/green]")
@@ -335,8 +407,18 @@ def start(
 
 
 @app.command()
-def status() -> None:
+def status(
+    gpus: bool = typer.Option(
+        True,
+        "--gpus/--no-gpus",
+        help="Detect GPUs (--no-gpus skips NVML initialization)",
+    ),
+) -> None:
     """Show current agent status and hardware info."""
+    from rich.panel import Panel
+    from rich.table import Table
+
+    console = _get_console()
     console.print(
         Panel.fit(
             f"[bold blue]DistributedCompute Agent[/bold blue] v{__version__}",
@@ -345,8 +427,8 @@ def status() -> None:
     )
 
     # Hardware detection
-    hardware = HardwareDetector()
-    specs = hardware.get_full_specs()
+    with HardwareDetector(enable_gpus=gpus) as hardware:
+        specs = hardware.get_full_specs()
 
     # System info table
     sys_table = Table(title="System Information")
@@ -379,7 +461,7 @@ def status() -> None:
             )
 
         console.print(gpu_table)
-    else:
+    elif gpus:
         console.print("[yellow]No NVIDIA GPUs detected[/yellow]")
 
     # Check Docker
@@ -396,6 +478,9 @@ def status() -> None:
 @app.command()
 def setup() -> None:
     """Interactive setup wizard for initial configuration."""
+    from rich.panel import Panel
+
+    console = _get_console()
     console.print(
         Panel.fit(
             "[bold blue]DistributedCompute Agent Setup[/bold blue]",
@@ -476,12 +561,14 @@ logging:
 @app.command()
 def version() -> None:
     """Show version information."""
+    console = _get_console()
     console.print(f"distributed-agent v{__version__}")
 
 
 @app.command()
 def stop() -> None:
     """Stop the running agent gracefully."""
+    console = _get_console()
     console.print("[yellow]Sending stop signal to agent...[/yellow]")
     console.print("If the agent is running in this terminal, press Ctrl+C.")
     console.print("If running as a service, use your service manager to stop it.")
@@ -1,10 +1,26 @@
-"""Pydantic models matching the TypeScript shared-types for WebSocket communication."""
-
-from datetime import datetime
+"""Models matching the TypeScript shared-types for WebSocket communication.
+
+Hardware info and metrics are built by the agent itself, so they are msgspec
+Structs that skip validation. Messages in both directions are msgspec Structs
+tagged by their ``event`` field: agent -> backend events encode straight to
+JSON bytes with the tag written first, and backend -> agent commands form a
+tagged union, so decoding, dispatch on ``event`` and validation happen in a
+single pass. Leaf payloads that can never be part of a reference cycle are
+declared with ``gc=False`` so the garbage collector does not track them.
+
+Validation only happens at the untrusted boundary: decoding backend commands
+with parse_backend_command_json() or parse_backend_command(). Struct
+constructors never validate, so the agent must build outgoing events and
+metrics only from values it already holds with the right types (IDs from
+accepted commands or Docker, numbers from psutil/NVML).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field
+import msgspec
 
 
 # ==========================================
@@ -35,7 +51,7 @@ class RentalStatus(str, Enum):
 # ==========================================
 
 
-class GPUInfo(BaseModel):
+class GPUInfo(msgspec.Struct, frozen=True, kw_only=True):
     """Information about a single GPU."""
 
     index: int
@@ -48,7 +64,7 @@ class GPUInfo(BaseModel):
     utilization: float | None = None
 
 
-class SystemInfo(BaseModel):
+class SystemInfo(msgspec.Struct, frozen=True, kw_only=True):
     """System hardware information."""
 
     cpu_model: str
@@ -63,7 +79,7 @@ class SystemInfo(BaseModel):
     hostname: str
 
 
-class NetworkInfo(BaseModel):
+class NetworkInfo(msgspec.Struct, frozen=True, kw_only=True):
     """Network bandwidth information."""
 
     download_mbps: float
@@ -71,7 +87,7 @@ class NetworkInfo(BaseModel):
     latency_ms: float
 
 
-class HardwareSpecs(BaseModel):
+class HardwareSpecs(msgspec.Struct, frozen=True, kw_only=True):
     """Complete hardware specifications for registration."""
 
     gpus: list[GPUInfo]
@@ -84,14 +100,14 @@ class HardwareSpecs(BaseModel):
 # ==========================================
 
 
-class NodeMetrics(BaseModel):
+class NodeMetrics(msgspec.Struct, kw_only=True):
     """Real-time metrics sent in heartbeat."""
 
     cpu_temp: float | None = None
     cpu_usage_percent: float
-    gpu_temp: list[float] = Field(default_factory=list)
-    gpu_utilization: list[float] = Field(default_factory=list)
-    gpu_memory_used_mb: list[int] = Field(default_factory=list)
+    gpu_temp: list[float] = msgspec.field(default_factory=list)
+    gpu_utilization: list[float] = msgspec.field(default_factory=list)
+    gpu_memory_used_mb: list[int] = msgspec.field(default_factory=list)
     ram_usage_mb: int
     ram_total_mb: int
     disk_usage_gb: float
@@ -105,7 +121,7 @@ class NodeMetrics(BaseModel):
 # ==========================================
 
 
-class HeartbeatEventData(BaseModel):
+class HeartbeatEventData(msgspec.Struct):
     """Data payload for heartbeat event."""
 
     node_id: str
@@ -113,22 +129,26 @@ class HeartbeatEventData(BaseModel):
     metrics: NodeMetrics
 
 
-class HeartbeatEvent(BaseModel):
-    """Heartbeat event sent to backend every 5 seconds."""
+class HeartbeatEvent(msgspec.Struct, tag="heartbeat", tag_field="event"):
+    """
+    Heartbeat event sent to backend every 5 seconds.
+
+    BackendClient.send_heartbeat() writes this envelope from pre-encoded
+    bytes rather than building the Struct, so keep the two in sync.
+    """
 
-    event: str = "heartbeat"
     data: HeartbeatEventData
 
 
-class ConnectionInfo(BaseModel):
+class ConnectionInfo(msgspec.Struct, gc=False):
     """Connection info for a started instance."""
 
     ssh_host: str
     ssh_port: int
-    additional_ports: dict[str, int] = Field(default_factory=dict)
+    additional_ports: dict[str, int] = msgspec.field(default_factory=dict)
 
 
-class InstanceStartedEventData(BaseModel):
+class InstanceStartedEventData(msgspec.Struct):
     """Data payload for instance_started event."""
 
     rental_id: str
@@ -136,14 +156,13 @@ class InstanceStartedEventData(BaseModel):
     connection_info: ConnectionInfo
 
 
-class InstanceStartedEvent(BaseModel):
+class InstanceStartedEvent(msgspec.Struct, tag="instance_started", tag_field="event"):
     """Event sent when a container is successfully started."""
 
-    event: str = "instance_started"
     data: InstanceStartedEventData
 
 
-class InstanceStoppedEventData(BaseModel):
+class InstanceStoppedEventData(msgspec.Struct, gc=False):
     """Data payload for instance_stopped event."""
 
     rental_id: str
@@ -152,26 +171,25 @@ class InstanceStoppedEventData(BaseModel):
     error_message: str | None = None
 
 
-class InstanceStoppedEvent(BaseModel):
+class InstanceStoppedEvent(msgspec.Struct, tag="instance_stopped", tag_field="event"):
     """Event sent when a container is stopped."""
 
-    event: str = "instance_stopped"
     data: InstanceStoppedEventData
 
 
-class AgentErrorEventData(BaseModel):
+class AgentErrorEventData(msgspec.Struct, gc=False):
     """Data payload for agent_error event."""
 
     node_id: str
     error_code: str
     message: str
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    # Encoded by msgspec as an RFC 3339 string, e.g. "2024-01-01T12:00:00.123456Z"
+    timestamp: datetime = msgspec.field(default_factory=lambda: datetime.now(timezone.utc))
 
 
-class AgentErrorEvent(BaseModel):
+class AgentErrorEvent(msgspec.Struct, tag="agent_error", tag_field="event"):
     """Event sent when an error occurs."""
 
-    event: str = "agent_error"
     data: AgentErrorEventData
 
 
@@ -180,7 +198,7 @@ class AgentErrorEvent(BaseModel):
 # ==========================================
 
 
-class ResourceLimits(BaseModel):
+class ResourceLimits(msgspec.Struct, gc=False):
     """Resource limits for a container."""
 
     gpu_indices: list[str]
@@ -189,24 +207,23 @@ class ResourceLimits(BaseModel):
     disk_limit: str | None = None
 
 
-class StartInstanceCommandData(BaseModel):
+class StartInstanceCommandData(msgspec.Struct):
     """Data payload for start_instance command."""
 
     rental_id: str
     image: str
     resource_limits: ResourceLimits
-    env_vars: dict[str, str] = Field(default_factory=dict)
-    proxy_port_mapping: dict[str, int] = Field(default_factory=dict)
+    env_vars: dict[str, str] = msgspec.field(default_factory=dict)
+    proxy_port_mapping: dict[str, int] = msgspec.field(default_factory=dict)
 
 
-class StartInstanceCommand(BaseModel):
+class StartInstanceCommand(msgspec.Struct, tag="start_instance", tag_field="event"):
     """Command to start a new container instance."""
 
-    event: str = "start_instance"
     data: StartInstanceCommandData
 
 
-class StopInstanceCommandData(BaseModel):
+class StopInstanceCommandData(msgspec.Struct, gc=False):
     """Data payload for stop_instance command."""
 
     rental_id: str
@@ -215,46 +232,43 @@ class StopInstanceCommandData(BaseModel):
     timeout_seconds: int = 30
 
 
-class StopInstanceCommand(BaseModel):
+class StopInstanceCommand(msgspec.Struct, tag="stop_instance", tag_field="event"):
     """Command to stop a container instance."""
 
-    event: str = "stop_instance"
     data: StopInstanceCommandData
 
 
-class DrainNodeCommandData(BaseModel):
+class DrainNodeCommandData(msgspec.Struct, gc=False):
     """Data payload for drain_node command."""
 
     node_id: str
     reason: str | None = None
 
 
-class DrainNodeCommand(BaseModel):
+class DrainNodeCommand(msgspec.Struct, tag="drain_node", tag_field="event"):
     """Command to drain the node (stop accepting new rentals)."""
 
-    event: str = "drain_node"
     data: DrainNodeCommandData
 
 
-class AgentConfigData(BaseModel):
+class AgentConfigData(msgspec.Struct, gc=False):
     """Agent configuration that can be updated remotely."""
 
     heartbeat_interval_ms: int = 5000
     max_concurrent_rentals: int = 0
-    allowed_images: list[str] = Field(default_factory=list)
+    allowed_images: list[str] = msgspec.field(default_factory=list)
 
 
-class UpdateConfigCommandData(BaseModel):
+class UpdateConfigCommandData(msgspec.Struct):
     """Data payload for update_config command."""
 
     node_id: str
     config: AgentConfigData
 
 
-class UpdateConfigCommand(BaseModel):
+class UpdateConfigCommand(msgspec.Struct, tag="update_config", tag_field="event"):
     """Command to update agent configuration."""
 
-    event: str = "update_config"
     data: UpdateConfigCommandData
 
 
@@ -263,8 +277,9 @@ class UpdateConfigCommand(BaseModel):
 # ==========================================
 
 
-class ActiveRental(BaseModel):
-    """Represents an active rental with its container."""
+@dataclass(slots=True)
+class ActiveRental:
+    """Represents an active rental with its container (agent-local state only)."""
 
     rental_id: str
     container_id: str
@@ -281,19 +296,35 @@ class ActiveRental(BaseModel):
 
 BackendCommand = StartInstanceCommand | StopInstanceCommand | DrainNodeCommand | UpdateConfigCommand
 
+# strict=False allows the same lax coercions (e.g. "5" -> 5) the pydantic models accepted
+_command_decoder: msgspec.json.Decoder[BackendCommand] = msgspec.json.Decoder(
+    BackendCommand, strict=False
+)
+
+
+def parse_backend_command_json(raw: bytes | str) -> BackendCommand:
+    """
+    Decode a raw WebSocket message from the backend into a typed command.
+
+    Raises:
+        msgspec.ValidationError: If the event is unknown or its data is invalid
+        msgspec.DecodeError: If the message is not valid JSON
+    """
+    return _command_decoder.decode(raw)
+
+
+_COMMAND_TYPES: dict[str, type[BackendCommand]] = {
+    "start_instance": StartInstanceCommand,
+    "stop_instance": StopInstanceCommand,
+    "drain_node": DrainNodeCommand,
+    "update_config": UpdateConfigCommand,
+}
+
 
 def parse_backend_command(data: dict[str, Any]) -> BackendCommand | None:
-    """Parse a raw message from the backend into a typed command."""
+    """Parse an already-decoded message from the backend into a typed command."""
     event_type = data.get("event")
-
-    match event_type:
-        case "start_instance":
-            return StartInstanceCommand(**data)
-        case "stop_instance":
-            return StopInstanceCommand(**data)
-        case "drain_node":
-            return DrainNodeCommand(**data)
-        case "update_config":
-            return UpdateConfigCommand(**data)
-        case _:
-            return None
+    command_type = _COMMAND_TYPES.get(event_type) if isinstance(event_type, str) else None
+    if command_type is None:
+        return None
+    return msgspec.convert(data, command_type, strict=False)
@@ -1,10 +1,15 @@
 """FRP tunnel management for NAT traversal."""
 
+import asyncio
+import atexit
+import functools
 import os
 import shutil
-import signal
 import subprocess
+import sys
 import tempfile
+import weakref
+from collections import deque
 from pathlib import Path
 
 import structlog
@@ -26,6 +31,86 @@ class FRPCNotFoundError(TunnelError):
     pass
 
 
+@functools.lru_cache(maxsize=1)
+def _pdeathsig_prefix() -> tuple[str, ...]:
+    """
+    Command prefix that makes frpc get SIGTERM when the agent dies.
+
+    setpriv (util-linux) sets PR_SET_PDEATHSIG and execs frpc in place, so
+    the pid is still frpc's. This covers exits where the agent cannot clean
+    up itself, such as SIGKILL or a crash, so no frpc process is left
+    holding public ports. It runs as a separate binary rather than a
+    preexec_fn, which is unsafe with the agent's threads running. Empty when
+    setpriv is missing or too old to support --pdeathsig.
+    """
+    if not sys.platform.startswith("linux"):
+        return ()
+
+    setpriv = shutil.which("setpriv")
+    if setpriv is None:
+        return ()
+    try:
+        result = subprocess.run([setpriv, "--help"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return ()
+    if "--pdeathsig" not in result.stdout:
+        return ()
+
+    return (setpriv, "--pdeathsig", "TERM", "--")
+
+
+# Most recent frpc output lines kept per stream for get_tunnel_logs
+TUNNEL_LOG_LINES = 200
+
+# Searched after the directories on PATH
+FRPC_COMMON_DIRS = (
+    "/usr/local/bin",
+    "/usr/bin",
+    "~/.local/bin",
+    ".",
+    "./bin",
+)
+
+
+# (configured frpc_path, PATH) -> resolved frpc path; misses are not cached
+_frpc_paths: dict[tuple[str | None, str | None], str] = {}
+
+
+def _find_frpc(configured_path: str | None, path_env: str | None) -> str | None:
+    """
+    Locate the frpc binary: the configured path, then PATH, then FRPC_COMMON_DIRS.
+
+    Found paths are remembered per (configured_path, PATH) so managers created
+    on config reloads don't stat the same locations again. A miss is searched
+    again next time, so frpc installed after startup is still picked up.
+    """
+    key = (configured_path, path_env)
+    cached = _frpc_paths.get(key)
+    if cached is not None and os.access(cached, os.X_OK):
+        return cached
+
+    frpc_path: str | None = None
+    if configured_path:
+        if os.path.isfile(configured_path) and os.access(configured_path, os.X_OK):
+            frpc_path = configured_path
+        else:
+            logger.warning("Configured frpc path not valid", path=configured_path)
+
+    if frpc_path is None:
+        search_path = os.pathsep.join(
+            [path_env or os.defpath, *(os.path.expanduser(d) for d in FRPC_COMMON_DIRS)]
+        )
+        frpc_path = shutil.which("frpc", path=search_path)
+
+    if frpc_path is None:
+        _frpc_paths.pop(key, None)
+        return None
+
+    logger.info("Found frpc", path=frpc_path)
+    _frpc_paths[key] = frpc_path
+    return frpc_path
+
+
 class TunnelManager:
     """Manages FRP tunnels for exposing container ports publicly."""
 
@@ -33,8 +118,12 @@ class TunnelManager:
         """Initialize the tunnel manager."""
         self.config = config
         self._frpc_path: str | None = None
-        self._active_tunnels: dict[str, subprocess.Popen[bytes]] = {}
+        self._active_tunnels: dict[str, asyncio.subprocess.Process] = {}
         self._tunnel_configs: dict[str, Path] = {}  # rental_id -> config file path
+        # rental_id -> recent (stdout, stderr) lines, filled by the drain tasks
+        self._tunnel_logs: dict[str, tuple[deque[str], deque[str]]] = {}
+        self._drain_tasks: dict[str, tuple[asyncio.Task[None], ...]] = {}
+        _managers.add(self)
 
     @property
     def frpc_path(self) -> str:
@@ -42,43 +131,14 @@ class TunnelManager:
         if self._frpc_path is not None:
             return self._frpc_path
 
-        # Try configured path first
-        if self.config.frpc_path:
-            if os.path.isfile(self.config.frpc_path) and os.access(
-                self.config.frpc_path, os.X_OK
-            ):
-                self._frpc_path = self.config.frpc_path
-                return self._frpc_path
-            else:
-                logger.warning(
-                    "Configured frpc path not valid", path=self.config.frpc_path
-                )
-
-        # Try to find in PATH
-        frpc_in_path = shutil.which("frpc")
-        if frpc_in_path:
-            self._frpc_path = frpc_in_path
-            logger.info("Found frpc in PATH", path=frpc_in_path)
-            return self._frpc_path
+        frpc_path = _find_frpc(self.config.frpc_path, os.environ.get("PATH"))
+        if frpc_path is None:
+            raise FRPCNotFoundError(
+                "frpc binary not found. Please install FRP or set frpc_path in config."
+            )
 
-        # Try common locations
-        common_paths = [
-            "/usr/local/bin/frpc",
-            "/usr/bin/frpc",
-            os.path.expanduser("~/.local/bin/frpc"),
-            "./frpc",
-            "./bin/frpc",
-        ]
-
-        for path in common_paths:
-            if os.path.isfile(path) and os.access(path, os.X_OK):
-                self._frpc_path = path
-                logger.info("Found frpc", path=path)
-                return self._frpc_path
-
-        raise FRPCNotFoundError(
-            "frpc binary not found. Please install FRP or set frpc_path in config."
-        )
+        self._frpc_path = frpc_path
+        return self._frpc_path
 
     def _generate_tunnel_config(
         self,
@@ -94,36 +154,27 @@ class TunnelManager:
             port_mapping: Container port -> assigned public port
             local_ports: Container port -> actual host port (from Docker)
         """
-        config_lines = [
-            "[common]",
-            f"server_addr = {self.config.server_addr}",
-            f"server_port = {self.config.server_port}",
-        ]
-
-        if self.config.token:
-            config_lines.append(f"token = {self.config.token}")
-
-        config_lines.append("")
-
-        # Create a proxy for each port mapping
-        for container_port, public_port in port_mapping.items():
-            local_port = local_ports.get(container_port, int(container_port))
-            proxy_name = f"{rental_id[:8]}_{container_port}"
-
-            config_lines.extend(
-                [
-                    f"[{proxy_name}]",
-                    "type = tcp",
-                    "local_ip = 127.0.0.1",
-                    f"local_port = {local_port}",
-                    f"remote_port = {public_port}",
-                    "",
-                ]
-            )
+        token_line = f"token = {self.config.token}\n" if self.config.token else ""
+        common = (
+            "[common]\n"
+            f"server_addr = {self.config.server_addr}\n"
+            f"server_port = {self.config.server_port}\n"
+            f"{token_line}\n"
+        )
 
-        return "\n".join(config_lines)
+        # One proxy section per port mapping
+        proxies = "\n".join(
+            f"[{rental_id[:8]}_{container_port}]\n"
+            "type = tcp\n"
+            "local_ip = 127.0.0.1\n"
+            f"local_port = {local_ports.get(container_port, int(container_port))}\n"
+            f"remote_port = {public_port}\n"
+            for container_port, public_port in port_mapping.items()
+        )
 
-    def create_tunnel(
+        return common + proxies
+
+    async def create_tunnel(
         self,
         rental_id: str,
         port_mapping: dict[str, int],
@@ -156,22 +207,30 @@ class TunnelManager:
             rental_id, port_mapping, local_ports
         )
 
-        # Write config to temp file
-        config_file = Path(tempfile.mktemp(prefix=f"frpc_{rental_id[:8]}_", suffix=".ini"))
-        config_file.write_text(config_content)
+        # Write config to a temp file created atomically by mkstemp
+        fd, path = tempfile.mkstemp(prefix=f"frpc_{rental_id[:8]}_", suffix=".ini")
+        try:
+            os.write(fd, config_content.encode("utf-8"))
+        finally:
+            os.close(fd)
+        config_file = Path(path)
         self._tunnel_configs[rental_id] = config_file
 
         logger.debug("FRP config written", path=str(config_file))
 
         # Start frpc process
         try:
-            process = subprocess.Popen(
-                [self.frpc_path, "-c", str(config_file)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            process = await asyncio.create_subprocess_exec(
+                *_pdeathsig_prefix(),
+                self.frpc_path,
+                "-c",
+                str(config_file),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
 
             self._active_tunnels[rental_id] = process
+            self._start_log_drain(rental_id, process)
 
             logger.info(
                 "Tunnel started",
@@ -187,32 +246,37 @@ class TunnelManager:
             config_file.unlink(missing_ok=True)
             raise TunnelError(f"Failed to start tunnel: {e}")
 
-    def destroy_tunnel(self, rental_id: str) -> None:
+    async def destroy_tunnel(self, rental_id: str) -> None:
         """Stop and cleanup a tunnel for a rental."""
         process = self._active_tunnels.get(rental_id)
 
         if process is None:
             logger.debug("No tunnel found for rental", rental_id=rental_id)
+            # Drop logs kept for a tunnel that list_active_tunnels() found dead
+            self._stop_log_drain(rental_id)
             return
 
         logger.info("Destroying tunnel", rental_id=rental_id, pid=process.pid)
 
         try:
             # Try graceful termination first
-            process.terminate()
+            if process.returncode is None:
+                process.terminate()
 
             try:
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
                 # Force kill if needed
                 process.kill()
-                process.wait(timeout=2)
+                await asyncio.wait_for(process.wait(), timeout=2)
 
         except Exception as e:
             logger.warning("Error stopping tunnel process", error=str(e))
 
-        # Cleanup
-        del self._active_tunnels[rental_id]
+        # Cleanup, unless a concurrent destroy already did it while we waited
+        if self._active_tunnels.pop(rental_id, None) is None:
+            return
+        self._stop_log_drain(rental_id)
 
         # Remove config file
         config_file = self._tunnel_configs.pop(rental_id, None)
@@ -221,11 +285,16 @@ class TunnelManager:
 
         logger.info("Tunnel destroyed", rental_id=rental_id)
 
-    def destroy_all_tunnels(self) -> None:
-        """Stop all active tunnels."""
+    async def destroy_all_tunnels(self) -> None:
+        """Stop all active tunnels concurrently."""
         rental_ids = list(self._active_tunnels.keys())
-        for rental_id in rental_ids:
-            self.destroy_tunnel(rental_id)
+        results = await asyncio.gather(
+            *(self.destroy_tunnel(rental_id) for rental_id in rental_ids),
+            return_exceptions=True,
+        )
+        for rental_id, result in zip(rental_ids, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning("Failed to destroy tunnel", rental_id=rental_id, error=str(result))
 
     def get_tunnel_status(self, rental_id: str) -> str:
         """Get the status of a tunnel."""
@@ -234,41 +303,71 @@ class TunnelManager:
         if process is None:
             return "not_found"
 
-        poll_result = process.poll()
-        if poll_result is None:
+        # Set by the event loop's child watcher once the process has exited
+        returncode = process.returncode
+        if returncode is None:
             return "running"
-        elif poll_result == 0:
+        elif returncode == 0:
             return "exited_ok"
         else:
-            return f"exited_error_{poll_result}"
+            return f"exited_error_{returncode}"
 
-    def get_tunnel_logs(self, rental_id: str, timeout: float = 0.1) -> tuple[str, str]:
+    def get_tunnel_logs(self, rental_id: str) -> tuple[str, str]:
         """
-        Get stdout/stderr from a tunnel process (non-blocking).
+        Get the most recent stdout/stderr lines of a tunnel process.
 
         Returns:
             Tuple of (stdout, stderr)
         """
-        process = self._active_tunnels.get(rental_id)
-
-        if process is None or process.stdout is None or process.stderr is None:
+        logs = self._tunnel_logs.get(rental_id)
+        if logs is None:
             return "", ""
 
-        try:
-            stdout, stderr = process.communicate(timeout=timeout)
-            return (
-                stdout.decode("utf-8") if stdout else "",
-                stderr.decode("utf-8") if stderr else "",
-            )
-        except subprocess.TimeoutExpired:
-            return "", ""
+        stdout, stderr = logs
+        return "".join(stdout), "".join(stderr)
+
+    def _start_log_drain(self, rental_id: str, process: asyncio.subprocess.Process) -> None:
+        """
+        Continuously read a tunnel's output into bounded buffers.
+
+        Keeps the pipes from filling up and blocking frpc, and lets logs be
+        read any number of times without touching the pipes.
+        """
+        stdout: deque[str] = deque(maxlen=TUNNEL_LOG_LINES)
+        stderr: deque[str] = deque(maxlen=TUNNEL_LOG_LINES)
+        self._tunnel_logs[rental_id] = (stdout, stderr)
+
+        tasks = []
+        for stream, buffer in ((process.stdout, stdout), (process.stderr, stderr)):
+            if stream is not None:
+                tasks.append(asyncio.create_task(self._drain(stream, buffer)))
+        self._drain_tasks[rental_id] = tuple(tasks)
+
+    def _stop_log_drain(self, rental_id: str) -> None:
+        """Cancel a tunnel's drain tasks and drop its buffered logs."""
+        for task in self._drain_tasks.pop(rental_id, ()):
+            task.cancel()
+        self._tunnel_logs.pop(rental_id, None)
+
+    @staticmethod
+    async def _drain(stream: asyncio.StreamReader, buffer: deque[str]) -> None:
+        """Append lines from stream to buffer until EOF."""
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # Line longer than the stream limit; readline already dropped it
+                continue
+            if not line:
+                return
+            buffer.append(line.decode("utf-8", "replace"))
 
     def list_active_tunnels(self) -> dict[str, int]:
         """Get a mapping of rental_id -> process pid for active tunnels."""
         active = {}
 
         for rental_id, process in list(self._active_tunnels.items()):
-            if process.poll() is None:  # Still running
+            if process.returncode is None:  # Still running
                 active[rental_id] = process.pid
             else:
                 # Clean up dead tunnel
@@ -276,6 +375,7 @@ class TunnelManager:
                 config_file = self._tunnel_configs.pop(rental_id, None)
                 if config_file and config_file.exists():
                     config_file.unlink()
+                # Its logs stay readable until destroy_tunnel() is called
                 del self._active_tunnels[rental_id]
 
         return active
@@ -287,6 +387,27 @@ class TunnelManager:
             results[rental_id] = self.get_tunnel_status(rental_id)
         return results
 
-    def __del__(self) -> None:
-        """Cleanup on destruction."""
-        self.destroy_all_tunnels()
+    def _terminate_all(self) -> None:
+        """
+        Signal every running frpc process to exit, without waiting.
+
+        Called at interpreter exit for exits that skip shutdown();
+        destroy_all_tunnels() remains the normal path.
+        """
+        for process in self._active_tunnels.values():
+            if process.returncode is None:
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
+
+
+# Live managers, so one atexit hook can reach their processes without keeping them alive
+_managers: weakref.WeakSet[TunnelManager] = weakref.WeakSet()
+
+
+@atexit.register
+def _terminate_all_tunnels() -> None:
+    """Signal the frpc processes of every live TunnelManager to exit."""
+    for manager in list(_managers):
+        manager._terminate_all()
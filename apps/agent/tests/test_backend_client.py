@@ -0,0 +1,132 @@
+"""Tests for the backend WebSocket client."""
+
+from typing import Any
+
+import msgspec
+from websockets.exceptions import ConnectionClosed
+
+from distributed_agent.backend_client import BackendClient
+from distributed_agent.config import BackendConfig, NodeConfig
+from distributed_agent.models import (
+    BackendCommand,
+    HeartbeatEvent,
+    HeartbeatEventData,
+    NodeMetrics,
+    NodeStatus,
+    StopInstanceCommand,
+)
+
+
+class FakeConnection:
+    """Records sent frames in place of a websockets ClientConnection."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[Any, bool | None]] = []
+        self.closed = False
+
+    async def send(self, data: Any, text: bool | None = None) -> None:
+        if self.closed:
+            raise ConnectionClosed(None, None)
+        self.sent.append((data, text))
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def make_client() -> tuple[BackendClient, FakeConnection]:
+    client = BackendClient(BackendConfig(), NodeConfig(id="node-1"))
+    connection = FakeConnection()
+    client._connection = connection
+    client._connected = True
+    return client, connection
+
+
+def make_metrics() -> NodeMetrics:
+    return NodeMetrics(
+        cpu_temp=None,
+        cpu_usage_percent=12.5,
+        gpu_temp=[40.0],
+        gpu_utilization=[5.0],
+        gpu_memory_used_mb=[1000],
+        ram_usage_mb=2048,
+        ram_total_mb=8192,
+        disk_usage_gb=10.25,
+        disk_total_gb=100.0,
+    )
+
+
+async def test_send_heartbeat_matches_heartbeat_event() -> None:
+    client, connection = make_client()
+    client.status = NodeStatus.BUSY
+    metrics = make_metrics()
+
+    assert await client.send_heartbeat(metrics)
+
+    expected = msgspec.json.encode(
+        HeartbeatEvent(
+            data=HeartbeatEventData(node_id="node-1", status=NodeStatus.BUSY, metrics=metrics)
+        )
+    )
+    assert connection.sent == [(expected, True)]
+
+
+async def test_send_reports_closed_connection() -> None:
+    client, connection = make_client()
+    connection.closed = True
+
+    assert not await client.send_error("E", "message")
+    assert not client.is_connected
+
+
+async def test_send_when_disconnected() -> None:
+    client = BackendClient(BackendConfig(), NodeConfig(id="node-1"))
+    assert not await client.send_error("E", "message")
+
+
+async def test_handle_message_dispatches_raw_bytes() -> None:
+    client, _ = make_client()
+    received: list[BackendCommand] = []
+
+    async def handler(command: BackendCommand) -> None:
+        received.append(command)
+
+    client.register_handler("stop_instance", handler)
+    await client._handle_message(
+        b'{"event": "stop_instance", "data": {"rental_id": "r1", "container_id": "c1"}}'
+    )
+
+    assert len(received) == 1
+    assert isinstance(received[0], StopInstanceCommand)
+    assert received[0].data.timeout_seconds == 30
+
+
+async def test_handle_message_ignores_unknown_and_invalid_messages() -> None:
+    client, connection = make_client()
+    called = False
+
+    async def handler(command: BackendCommand) -> None:
+        nonlocal called
+        called = True
+
+    client.register_handler("stop_instance", handler)
+    await client._handle_message(b'{"event": "reboot", "data": {}}')
+    await client._handle_message(b"{not json")
+
+    assert not called
+    assert connection.sent == []
+
+
+async def test_handler_error_is_reported_to_backend() -> None:
+    client, connection = make_client()
+
+    async def handler(command: BackendCommand) -> None:
+        raise RuntimeError("boom")
+
+    client.register_handler("drain_node", handler)
+    await client._handle_message(b'{"event": "drain_node", "data": {"node_id": "node-1"}}')
+
+    assert len(connection.sent) == 1
+    event = msgspec.json.decode(connection.sent[0][0])
+    assert event["event"] == "agent_error"
+    assert event["data"]["error_code"] == "HANDLER_ERROR"
+    assert event["data"]["message"] == "boom"
@@ -0,0 +1,72 @@
+"""Tests for configuration loading."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from distributed_agent.config import AgentSettings, _expand_env_vars
+
+
+def test_expand_env_vars(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AGENT_TEST_TOKEN", "secret")
+    monkeypatch.setenv("AGENT_TEST_PORT", "7000")
+
+    assert _expand_env_vars("token: $AGENT_TEST_TOKEN") == "token: secret"
+    assert _expand_env_vars("port: ${AGENT_TEST_PORT}0") == "port: 70000"
+    assert _expand_env_vars("$AGENT_TEST_TOKEN-$AGENT_TEST_PORT") == "secret-7000"
+
+
+def test_expand_env_vars_leaves_unset_and_literal_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("AGENT_TEST_UNSET", raising=False)
+
+    assert _expand_env_vars("a: $AGENT_TEST_UNSET") == "a: $AGENT_TEST_UNSET"
+    assert _expand_env_vars("b: ${AGENT_TEST_UNSET}") == "b: ${AGENT_TEST_UNSET}"
+    assert _expand_env_vars("price: $ 5, ${}") == "price: $ 5, ${}"
+
+
+def write_config(path: Path, node_id: str) -> None:
+    path.write_text(f"node:\n  id: {node_id}\nfrp:\n  token: $AGENT_TEST_FRP_TOKEN\n")
+
+
+def test_from_yaml_expands_env_vars(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AGENT_TEST_FRP_TOKEN", "frp-secret")
+    path = tmp_path / "agent.yaml"
+    write_config(path, "node-1")
+
+    settings = AgentSettings.from_yaml(path)
+
+    assert settings.node.id == "node-1"
+    assert settings.frp.token == "frp-secret"
+
+
+def test_from_yaml_reuses_parse_for_unchanged_file(tmp_path: Path) -> None:
+    path = tmp_path / "agent.yaml"
+    write_config(path, "node-1")
+
+    first = AgentSettings.from_yaml(path)
+    hits = AgentSettings._load_yaml.cache_info().hits
+    second = AgentSettings.from_yaml(path)
+
+    assert AgentSettings._load_yaml.cache_info().hits == hits + 1
+    # Each call gets its own copy, so changes don't leak into the cache
+    second.node.id = "changed"
+    assert first.node.id == "node-1"
+    assert AgentSettings.from_yaml(path).node.id == "node-1"
+
+
+def test_from_yaml_reloads_changed_file(tmp_path: Path) -> None:
+    path = tmp_path / "agent.yaml"
+    write_config(path, "node-1")
+    assert AgentSettings.from_yaml(path).node.id == "node-1"
+
+    write_config(path, "node-2")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert AgentSettings.from_yaml(path).node.id == "node-2"
+
+
+def test_from_yaml_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        AgentSettings.from_yaml(tmp_path / "missing.yaml")
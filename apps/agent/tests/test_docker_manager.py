@@ -0,0 +1,41 @@
+"""Tests for Docker image allow-listing."""
+
+from distributed_agent.config import DockerConfig
+from distributed_agent.docker_manager import DockerManager
+
+
+def test_compile_allowed_images_empty() -> None:
+    assert DockerManager._compile_allowed_images([]) is None
+
+
+def test_compile_allowed_images_wildcards() -> None:
+    pattern = DockerManager._compile_allowed_images(["pytorch/pytorch:*", "nvidia/cuda:12.?"])
+    assert pattern is not None
+
+    assert pattern.match("pytorch/pytorch:2.1.0-cuda12.1")
+    assert pattern.match("nvidia/cuda:12.1")
+    assert not pattern.match("nvidia/cuda:12.10")
+    assert not pattern.match("evil/pytorch/pytorch:latest")
+    assert not pattern.match("pytorch/pytorch")
+
+
+def test_is_image_allowed() -> None:
+    manager = DockerManager(DockerConfig(allowed_images=["jupyter/*"]))
+
+    assert manager.is_image_allowed("jupyter/scipy-notebook:latest")
+    assert not manager.is_image_allowed("ubuntu:22.04")
+
+
+def test_is_image_allowed_with_no_patterns() -> None:
+    manager = DockerManager(DockerConfig(allowed_images=[]))
+    assert not manager.is_image_allowed("ubuntu:22.04")
+
+
+def test_set_allowed_images() -> None:
+    manager = DockerManager(DockerConfig(allowed_images=["jupyter/*"]))
+
+    manager.set_allowed_images(["ubuntu:*"])
+
+    assert manager.config.allowed_images == ["ubuntu:*"]
+    assert manager.is_image_allowed("ubuntu:22.04")
+    assert not manager.is_image_allowed("jupyter/scipy-notebook:latest")
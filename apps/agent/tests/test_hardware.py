@@ -0,0 +1,67 @@
+"""Tests for /proc parsing in the hardware detector."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from distributed_agent.hardware import HardwareDetector
+
+MEMINFO = b"MemTotal:        8192000 kB\nMemFree:         1000000 kB\nMemAvailable:    4096000 kB\n"
+
+
+@pytest.fixture
+def detector() -> Iterator[HardwareDetector]:
+    hardware = HardwareDetector(enable_gpus=False)
+    yield hardware
+    hardware.close()
+
+
+def open_proc_files(
+    detector: HardwareDetector, tmp_path: Path, stat: bytes, meminfo: bytes
+) -> Path:
+    """Point the detector's /proc descriptors at fake files; returns the stat file."""
+    detector._close_proc_fds()
+    stat_path = tmp_path / "stat"
+    meminfo_path = tmp_path / "meminfo"
+    stat_path.write_bytes(stat)
+    meminfo_path.write_bytes(meminfo)
+    detector._proc_stat_fd = os.open(stat_path, os.O_RDONLY)
+    detector._proc_meminfo_fd = os.open(meminfo_path, os.O_RDONLY)
+    detector._last_cpu_times = (0, 0)
+    return stat_path
+
+
+def test_read_proc_linux(detector: HardwareDetector, tmp_path: Path) -> None:
+    # user nice system idle iowait irq softirq steal guest guest_nice
+    stat_path = open_proc_files(
+        detector, tmp_path, b"cpu  100 0 50 800 50 0 0 0 0 0\ncpu0 1 2 3 4\n", MEMINFO
+    )
+    detector._read_proc_linux()
+
+    # 150 busy out of 1000 jiffies since the previous read
+    stat_path.write_bytes(b"cpu  200 0 100 1600 100 0 0 0 0 0\ncpu0 1 2 3 4\n")
+    cpu_usage, ram_used_mb, ram_total_mb = detector._read_proc_linux()
+
+    assert cpu_usage == 15.0
+    assert ram_total_mb == 8000
+    assert ram_used_mb == 4000
+
+
+def test_read_proc_linux_without_new_ticks(detector: HardwareDetector, tmp_path: Path) -> None:
+    open_proc_files(detector, tmp_path, b"cpu  100 0 50 800 50 0 0 0 0 0\n", MEMINFO)
+    detector._read_proc_linux()
+
+    cpu_usage, _, _ = detector._read_proc_linux()
+
+    assert cpu_usage == 0.0
+
+
+def test_get_current_metrics_after_close() -> None:
+    hardware = HardwareDetector(enable_gpus=False)
+    metrics = hardware.get_current_metrics()
+    ram_total_mb = metrics.ram_total_mb
+    hardware.close()
+
+    assert hardware.get_current_metrics().ram_total_mb == ram_total_mb
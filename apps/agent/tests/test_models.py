@@ -0,0 +1,191 @@
+"""Tests for the WebSocket message models."""
+
+import json
+from datetime import datetime, timezone
+
+import msgspec
+import pytest
+
+from distributed_agent.models import (
+    AgentErrorEvent,
+    AgentErrorEventData,
+    ConnectionInfo,
+    DrainNodeCommand,
+    HeartbeatEvent,
+    HeartbeatEventData,
+    InstanceStartedEvent,
+    InstanceStartedEventData,
+    InstanceStoppedEvent,
+    InstanceStoppedEventData,
+    NodeMetrics,
+    NodeStatus,
+    StartInstanceCommand,
+    StopInstanceCommand,
+    UpdateConfigCommand,
+    parse_backend_command,
+    parse_backend_command_json,
+)
+
+# json.dumps(event.model_dump()) output of the previous pydantic models
+LEGACY_HEARTBEAT = (
+    '{"event": "heartbeat", "data": {"node_id": "node-1", "status": "busy", "metrics": '
+    '{"cpu_temp": 55.5, "cpu_usage_percent": 12.5, "gpu_temp": [40.0, 41.0], '
+    '"gpu_utilization": [5.0, 6.0], "gpu_memory_used_mb": [1000, 2000], '
+    '"ram_usage_mb": 2048, "ram_total_mb": 8192, "disk_usage_gb": 10.25, '
+    '"disk_total_gb": 100.0, "network_rx_mbps": 1.5, "network_tx_mbps": 0.25}}}'
+)
+LEGACY_INSTANCE_STARTED = (
+    '{"event": "instance_started", "data": {"rental_id": "r1", "container_id": "c1", '
+    '"connection_info": {"ssh_host": "h", "ssh_port": 2222, "additional_ports": {"80": 8080}}}}'
+)
+LEGACY_INSTANCE_STOPPED = (
+    '{"event": "instance_stopped", "data": {"rental_id": "r1", "container_id": "c1", '
+    '"reason": "error", "error_message": "boom"}}'
+)
+LEGACY_AGENT_ERROR = (
+    '{"event": "agent_error", "data": {"node_id": "node-1", "error_code": "HANDLER_ERROR", '
+    '"message": "bad", "timestamp": "2024-01-01T12:00:00"}}'
+)
+
+
+def compact(legacy: str) -> bytes:
+    """Re-serialize legacy JSON without whitespace, keeping key order and number formatting."""
+    return json.dumps(json.loads(legacy), separators=(",", ":")).encode()
+
+
+def make_metrics() -> NodeMetrics:
+    return NodeMetrics(
+        cpu_temp=55.5,
+        cpu_usage_percent=12.5,
+        gpu_temp=[40.0, 41.0],
+        gpu_utilization=[5.0, 6.0],
+        gpu_memory_used_mb=[1000, 2000],
+        ram_usage_mb=2048,
+        ram_total_mb=8192,
+        disk_usage_gb=10.25,
+        disk_total_gb=100.0,
+        network_rx_mbps=1.5,
+        network_tx_mbps=0.25,
+    )
+
+
+def test_heartbeat_event_matches_legacy_json() -> None:
+    event = HeartbeatEvent(
+        data=HeartbeatEventData(node_id="node-1", status=NodeStatus.BUSY, metrics=make_metrics())
+    )
+    assert msgspec.json.encode(event) == compact(LEGACY_HEARTBEAT)
+
+
+def test_instance_started_event_matches_legacy_json() -> None:
+    event = InstanceStartedEvent(
+        data=InstanceStartedEventData(
+            rental_id="r1",
+            container_id="c1",
+            connection_info=ConnectionInfo(
+                ssh_host="h", ssh_port=2222, additional_ports={"80": 8080}
+            ),
+        )
+    )
+    assert msgspec.json.encode(event) == compact(LEGACY_INSTANCE_STARTED)
+
+
+def test_instance_stopped_event_matches_legacy_json() -> None:
+    event = InstanceStoppedEvent(
+        data=InstanceStoppedEventData(
+            rental_id="r1", container_id="c1", reason="error", error_message="boom"
+        )
+    )
+    assert msgspec.json.encode(event) == compact(LEGACY_INSTANCE_STOPPED)
+
+
+def test_agent_error_event_matches_legacy_json_with_utc_timestamp() -> None:
+    event = AgentErrorEvent(
+        data=AgentErrorEventData(
+            node_id="node-1",
+            error_code="HANDLER_ERROR",
+            message="bad",
+            timestamp=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        )
+    )
+    # Timestamps are now aware, so they carry a "Z" the naive isoformat() lacked
+    expected = compact(LEGACY_AGENT_ERROR).replace(b'12:00:00"', b'12:00:00Z"')
+    assert msgspec.json.encode(event) == expected
+
+
+def test_agent_error_timestamp_defaults_to_aware_utc() -> None:
+    data = AgentErrorEventData(node_id="n", error_code="E", message="m")
+    assert data.timestamp.tzinfo is timezone.utc
+
+
+def test_parse_backend_command_json_start_instance() -> None:
+    raw = json.dumps(
+        {
+            "event": "start_instance",
+            "data": {
+                "rental_id": "r1",
+                "image": "pytorch/pytorch:latest",
+                "resource_limits": {"gpu_indices": ["0"], "cpu_cores": 4, "ram_limit": "16g"},
+                "proxy_port_mapping": {"22": 7001},
+            },
+        }
+    ).encode()
+
+    command = parse_backend_command_json(raw)
+
+    assert isinstance(command, StartInstanceCommand)
+    assert command.data.resource_limits.gpu_indices == ["0"]
+    assert command.data.env_vars == {}
+    assert command.data.proxy_port_mapping == {"22": 7001}
+
+
+def test_parse_backend_command_json_accepts_str() -> None:
+    command = parse_backend_command_json('{"event": "drain_node", "data": {"node_id": "n"}}')
+    assert isinstance(command, DrainNodeCommand)
+    assert command.data.reason is None
+
+
+def test_parse_backend_command_json_coerces_like_pydantic() -> None:
+    raw = (
+        b'{"event": "stop_instance", "data": {"rental_id": "r1", "container_id": "c1",'
+        b' "graceful": "false", "timeout_seconds": "5"}}'
+    )
+
+    command = parse_backend_command_json(raw)
+
+    assert isinstance(command, StopInstanceCommand)
+    assert command.data.graceful is False
+    assert command.data.timeout_seconds == 5
+
+
+def test_parse_backend_command_json_unknown_event() -> None:
+    with pytest.raises(msgspec.ValidationError):
+        parse_backend_command_json(b'{"event": "reboot", "data": {}}')
+
+
+def test_parse_backend_command_json_missing_field() -> None:
+    with pytest.raises(msgspec.ValidationError):
+        parse_backend_command_json(b'{"event": "drain_node", "data": {}}')
+
+
+def test_parse_backend_command_json_invalid_json() -> None:
+    with pytest.raises(msgspec.DecodeError):
+        parse_backend_command_json(b"{not json")
+
+
+def test_parse_backend_command_dict() -> None:
+    command = parse_backend_command(
+        {
+            "event": "update_config",
+            "data": {"node_id": "n", "config": {"heartbeat_interval_ms": "1000"}},
+        }
+    )
+
+    assert isinstance(command, UpdateConfigCommand)
+    assert command.data.config.heartbeat_interval_ms == 1000
+    assert command.data.config.allowed_images == []
+
+
+def test_parse_backend_command_dict_unknown_event() -> None:
+    assert parse_backend_command({"event": "reboot", "data": {}}) is None
+    assert parse_backend_command({"data": {}}) is None
+    assert parse_backend_command({"event": ["start_instance"]}) is None